@@ -6,27 +6,65 @@ image size, and optionally upscales to a target resolution for wallpapers such a
 
 Dependencies:
 - python -m pip install --upgrade openai pillow
+- Optional: python -m pip install pyvips (SIMD bicubic/bilinear upscale via libvips;
+  Lanczos upscales stay on Pillow). Installing Pillow-SIMD in place of pillow speeds
+  up the fallback resize path as well.
 """
 
 from __future__ import annotations
 
 import argparse
 import base64
+import json
 import os
 import sys
-from dataclasses import dataclass
+import time
+from dataclasses import asdict, dataclass
 from datetime import datetime
+from functools import lru_cache
 from io import BytesIO
 from pathlib import Path
-from typing import Any, Tuple
+from typing import TYPE_CHECKING, Any, Tuple
 
-import httpx
-from openai import OpenAI
-from PIL import Image
+# asyncio, httpx, openai and PIL are slow to import, so they are loaded where
+# they are used; --help and argument errors return without touching them.
+if TYPE_CHECKING:
+    import httpx
+    from openai import OpenAI
+    from PIL import Image
 
 
 # Supported by current DALL-E endpoint: keep in sync with API docs.
 ALLOWED_SIZES: Tuple[str, ...] = ("1536x1024", "1024x1536", "1024x1024")
+# (width, height, size string, aspect ratio) for each allowed size, parsed once.
+_ALLOWED_SIZE_TABLE: Tuple[tuple[int, int, str, float], ...] = tuple(
+    (int(w), int(h), size, int(w) / int(h))
+    for size in ALLOWED_SIZES
+    for w, h in [size.split("x")]
+)
+
+# Resample filter name -> (Pillow filter attribute, libvips kernel).
+RESAMPLE_FILTERS: dict[str, tuple[str, str]] = {
+    "lanczos": ("LANCZOS", "lanczos3"),
+    "bicubic": ("BICUBIC", "cubic"),
+    "bilinear": ("BILINEAR", "linear"),
+}
+
+# Output format -> (Pillow format name, save options). PNG uses fast zlib level 1
+# since the wallpaper is rewritten often; JPEG/WebP are smaller and faster still.
+OUTPUT_FORMATS: dict[str, tuple[str, dict[str, Any]]] = {
+    "png": ("PNG", {"optimize": False, "compress_level": 1}),
+    "jpg": ("JPEG", {"quality": 92}),
+    "webp": ("WEBP", {"quality": 92}),
+}
+
+# Auto-context lookups are cached under $XDG_CACHE_HOME so repeated runs skip the network.
+LOOKUP_CACHE_PATH = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "dalle_background" / "lookups.json"
+)
+GEOCODE_CACHE_TTL = 30 * 24 * 3600.0
+IP_CACHE_TTL = 3600.0
+WEATHER_CACHE_TTL = 600.0
 
 
 @dataclass
@@ -41,6 +79,8 @@ class GenerationConfig:
     model: str
     style: str | None
     skip_upscale: bool
+    resample: str
+    image_format: str
 
 
 @dataclass
@@ -105,8 +145,8 @@ def parse_args() -> argparse.Namespace:
     )
     parser.add_argument(
         "--output",
-        default="background.png",
-        help="Where to save the final image. Defaults to background.png.",
+        default=None,
+        help="Where to save the final image. Defaults to background.png, or background.<ext> for --format.",
     )
     parser.add_argument(
         "--api-key",
@@ -129,7 +169,28 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Save the base image returned by the API without resizing to the target resolution.",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--resample",
+        choices=tuple(RESAMPLE_FILTERS),
+        default="bicubic",
+        help="Filter used to upscale to the target resolution. Defaults to bicubic.",
+    )
+    parser.add_argument(
+        "--format",
+        choices=tuple(OUTPUT_FORMATS),
+        default=None,
+        help=(
+            "Output image format. Defaults to the --output extension, or png if it is not recognized. "
+            "Must match the --output extension when both are given."
+        ),
+    )
+    args = parser.parse_args()
+    # Resolved here so a bad combination fails before any auto-context request.
+    try:
+        args.output, args.format = output_target(args.output, args.format)
+    except ValueError as exc:
+        parser.error(str(exc))
+    return args
 
 
 def build_prompt(
@@ -172,10 +233,83 @@ def safe_number(value: Any) -> float | None:
     return None
 
 
-def http_get_json(url: str) -> Any:
+def join_unique(*parts: Any) -> str:
+    """Join the non-blank string parts with ', ', keeping the first of any repeats."""
+    seen: set[str] = set()
+    labels: list[str] = []
+    for part in parts:
+        if not isinstance(part, str):
+            continue
+        label = part.strip()
+        if label and label not in seen:
+            seen.add(label)
+            labels.append(label)
+    return ", ".join(labels)
+
+
+def load_lookup_cache() -> dict[str, Any]:
+    try:
+        data = json.loads(LOOKUP_CACHE_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save_lookup_cache(cache: dict[str, Any]) -> None:
+    now = time.time()
+    fresh = {
+        key: entry
+        for key, entry in cache.items()
+        if isinstance(entry, dict) and (safe_number(entry.get("expires")) or 0.0) > now
+    }
+    tmp_path = LOOKUP_CACHE_PATH.with_name(f"{LOOKUP_CACHE_PATH.name}.{os.getpid()}.tmp")
     try:
-        with httpx.Client(timeout=10.0, follow_redirects=True) as client:
-            response = client.get(url)
+        LOOKUP_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        # Write aside and rename so a concurrent run never reads a half-written cache.
+        tmp_path.write_text(json.dumps(fresh), encoding="utf-8")
+        os.replace(tmp_path, LOOKUP_CACHE_PATH)
+    except OSError as exc:
+        tmp_path.unlink(missing_ok=True)
+        print(f"[warn] could not write lookup cache {LOOKUP_CACHE_PATH}: {exc}", file=sys.stderr)
+
+
+def cache_get(cache: dict[str, Any], key: str) -> Any:
+    entry = cache.get(key)
+    if not isinstance(entry, dict):
+        return None
+    expires = safe_number(entry.get("expires"))
+    if expires is None or expires <= time.time():
+        return None
+    return entry.get("value")
+
+
+def cache_set(cache: dict[str, Any], key: str, value: Any, ttl: float) -> None:
+    cache[key] = {"value": value, "expires": time.time() + ttl}
+
+
+def cached_coords(cache: dict[str, Any], key: str) -> tuple[float, float, str] | None:
+    value = cache_get(cache, key)
+    if not isinstance(value, list) or len(value) != 3:
+        return None
+    lat, lon, label = safe_number(value[0]), safe_number(value[1]), value[2]
+    if lat is None or lon is None or not isinstance(label, str):
+        return None
+    return lat, lon, label
+
+
+def cached_weather(cache: dict[str, Any], key: str) -> WeatherContext | None:
+    value = cache_get(cache, key)
+    if not isinstance(value, dict):
+        return None
+    try:
+        return WeatherContext(**value)
+    except TypeError:
+        return None
+
+
+async def http_get_json(client: httpx.AsyncClient, url: str, params: dict[str, Any] | None = None) -> Any:
+    try:
+        response = await client.get(url, params=params)
         if response.status_code != 200:
             return None
         return response.json()
@@ -184,10 +318,14 @@ def http_get_json(url: str) -> Any:
         return None
 
 
-def geocode_location(api_key: str, query: str, lang: str) -> tuple[float, float, str] | None:
-    params = httpx.QueryParams({"q": query, "limit": 1, "lang": lang, "appid": api_key})
-    url = f"https://api.openweathermap.org/geo/1.0/direct?{params}"
-    payload = http_get_json(url)
+async def geocode_location(
+    client: httpx.AsyncClient, api_key: str, query: str, lang: str
+) -> tuple[float, float, str] | None:
+    payload = await http_get_json(
+        client,
+        "https://api.openweathermap.org/geo/1.0/direct",
+        {"q": query, "limit": 1, "lang": lang, "appid": api_key},
+    )
     if not isinstance(payload, list) or len(payload) == 0:
         return None
 
@@ -203,17 +341,12 @@ def geocode_location(api_key: str, query: str, lang: str) -> tuple[float, float,
     name = entry.get("name")
     state = entry.get("state")
     country = entry.get("country")
-    label_parts = [
-        value
-        for value in [name, state, country]
-        if isinstance(value, str) and value.strip()
-    ]
-    label = ", ".join(label_parts) or "Local"
+    label = join_unique(name, state, country) or "Local"
     return lat, lon, label
 
 
-def ip_lookup_coords() -> tuple[float, float, str] | None:
-    payload = http_get_json("https://ipinfo.io/json")
+async def ip_lookup_coords(client: httpx.AsyncClient) -> tuple[float, float, str] | None:
+    payload = await http_get_json(client, "https://ipinfo.io/json")
     if not isinstance(payload, dict):
         return None
     loc = payload.get("loc")
@@ -228,12 +361,7 @@ def ip_lookup_coords() -> tuple[float, float, str] | None:
     city = payload.get("city")
     region = payload.get("region")
     country = payload.get("country")
-    label_parts = [
-        value
-        for value in [city, region, country]
-        if isinstance(value, str) and value.strip()
-    ]
-    label = ", ".join(label_parts) or "Local"
+    label = join_unique(city, region, country) or "Local"
     return lat, lon, label
 
 
@@ -241,24 +369,10 @@ def resolve_location_label(payload: dict, fallback_label: str) -> str:
     name = payload.get("name")
     sys_payload = payload.get("sys") if isinstance(payload.get("sys"), dict) else None
     country = sys_payload.get("country") if isinstance(sys_payload, dict) else None
-    label_parts = [
-        value
-        for value in [name, fallback_label, country]
-        if isinstance(value, str) and value.strip()
-    ]
-    label = ", ".join(dict.fromkeys(label_parts))  # dedupe while preserving order
-    return label or fallback_label
-
-
-def fetch_weather_context(api_key: str, lat: float, lon: float, lang: str, fallback_label: str) -> WeatherContext | None:
-    params = httpx.QueryParams(
-        {"lat": lat, "lon": lon, "units": "metric", "lang": lang, "appid": api_key}
-    )
-    url = f"https://api.openweathermap.org/data/2.5/weather?{params}"
-    payload = http_get_json(url)
-    if not isinstance(payload, dict):
-        return None
+    return join_unique(name, fallback_label, country) or fallback_label
+
 
+def parse_weather_payload(payload: dict) -> tuple[float | None, str | None]:
     main = payload.get("main") if isinstance(payload.get("main"), dict) else None
     temp = safe_number(main.get("temp")) if main else None
 
@@ -268,11 +382,135 @@ def fetch_weather_context(api_key: str, lat: float, lon: float, lang: str, fallb
         desc = weather_entries[0].get("description")
         if isinstance(desc, str) and desc.strip():
             conditions = desc.strip()
+    return temp, conditions
 
+
+async def fetch_weather_context(
+    client: httpx.AsyncClient, api_key: str, lat: float, lon: float, lang: str, fallback_label: str
+) -> WeatherContext | None:
+    payload = await http_get_json(
+        client,
+        "https://api.openweathermap.org/data/2.5/weather",
+        {"lat": lat, "lon": lon, "units": "metric", "lang": lang, "appid": api_key},
+    )
+    if not isinstance(payload, dict):
+        return None
+
+    temp, conditions = parse_weather_payload(payload)
     location_label = resolve_location_label(payload, fallback_label)
     return WeatherContext(location=location_label, temperature=temp, conditions=conditions)
 
 
+async def fetch_weather_by_query(
+    client: httpx.AsyncClient, api_key: str, query: str, lang: str
+) -> tuple[tuple[float, float, str], WeatherContext] | None:
+    """Resolve a place name and its current weather with a single request."""
+    payload = await http_get_json(
+        client,
+        "https://api.openweathermap.org/data/2.5/weather",
+        {"q": query, "units": "metric", "lang": lang, "appid": api_key},
+    )
+    if not isinstance(payload, dict):
+        return None
+
+    coord = payload.get("coord") if isinstance(payload.get("coord"), dict) else None
+    lat = safe_number(coord.get("lat")) if coord else None
+    lon = safe_number(coord.get("lon")) if coord else None
+    if lat is None or lon is None:
+        return None
+
+    name = payload.get("name")
+    sys_payload = payload.get("sys") if isinstance(payload.get("sys"), dict) else None
+    country = sys_payload.get("country") if isinstance(sys_payload, dict) else None
+    label = join_unique(name, country) or query
+
+    temp, conditions = parse_weather_payload(payload)
+    return (lat, lon, label), WeatherContext(location=label, temperature=temp, conditions=conditions)
+
+
+def geocode_cache_key(args: argparse.Namespace) -> str | None:
+    if not args.geo_query:
+        return None
+    return f"geocode:{args.weather_lang}:{args.geo_query.strip().lower()}"
+
+
+def weather_cache_key(lat: float, lon: float, lang: str) -> str:
+    return f"weather:{lang}:{lat:.2f},{lon:.2f}"
+
+
+async def resolve_coords(
+    client: httpx.AsyncClient, api_key: str, args: argparse.Namespace, cache: dict[str, Any]
+) -> tuple[float, float, str] | None:
+    geo_key = geocode_cache_key(args)
+    if geo_key:
+        coords = cached_coords(cache, geo_key)
+        if coords:
+            return coords
+
+    import asyncio
+
+    # The IP lookup is independent of geocoding, so start it right away and
+    # only wait on it when the geocode query is missing or fails.
+    ip_coords = cached_coords(cache, "ip")
+    ip_task = None if ip_coords else asyncio.create_task(ip_lookup_coords(client))
+
+    if geo_key:
+        coords = await geocode_location(client, api_key, args.geo_query, args.weather_lang)
+        if coords:
+            if ip_task:
+                ip_task.cancel()
+            cache_set(cache, geo_key, list(coords), GEOCODE_CACHE_TTL)
+            return coords
+
+    if ip_task:
+        ip_coords = await ip_task
+        if ip_coords:
+            cache_set(cache, "ip", list(ip_coords), IP_CACHE_TTL)
+    return ip_coords
+
+
+async def lookup_weather(api_key: str, args: argparse.Namespace) -> WeatherContext | None:
+    import httpx
+
+    cache = load_lookup_cache()
+    loaded = dict(cache)
+    try:
+        # One client for every lookup so the TLS connection to OpenWeather is reused.
+        async with httpx.AsyncClient(timeout=10.0, follow_redirects=True) as client:
+            # A by-name weather query returns coordinates and conditions in one round
+            # trip; geocoding + a coordinate lookup is only the fallback.
+            geo_key = geocode_cache_key(args)
+            if geo_key and not cached_coords(cache, geo_key):
+                combined = await fetch_weather_by_query(client, api_key, args.geo_query, args.weather_lang)
+                if combined:
+                    coords, weather = combined
+                    cache_set(cache, geo_key, list(coords), GEOCODE_CACHE_TTL)
+                    weather_key = weather_cache_key(coords[0], coords[1], args.weather_lang)
+                    cache_set(cache, weather_key, asdict(weather), WEATHER_CACHE_TTL)
+                    return weather
+
+            coords = await resolve_coords(client, api_key, args, cache)
+            if not coords:
+                print("[warn] Could not resolve location via geocode/IP; keeping provided context.", file=sys.stderr)
+                return None
+
+            lat, lon, label = coords
+            weather_key = weather_cache_key(lat, lon, args.weather_lang)
+            weather = cached_weather(cache, weather_key)
+            if weather:
+                return weather
+
+            weather = await fetch_weather_context(client, api_key, lat, lon, args.weather_lang, label)
+            if not weather:
+                print("[warn] Weather lookup failed; keeping provided context.", file=sys.stderr)
+                return None
+            cache_set(cache, weather_key, asdict(weather), WEATHER_CACHE_TTL)
+            return weather
+    finally:
+        if cache != loaded:
+            save_lookup_cache(cache)
+
+
 def auto_fill_context(
     api_key: str | None,
     args: argparse.Namespace,
@@ -284,19 +522,10 @@ def auto_fill_context(
         print("[warn] OPENWEATHER_API_KEY missing; skipping auto-context lookup.", file=sys.stderr)
         return context
 
-    coords: tuple[float, float, str] | None = None
-    if args.geo_query:
-        coords = geocode_location(api_key, args.geo_query, args.weather_lang)
-    if not coords:
-        coords = ip_lookup_coords()
-    if not coords:
-        print("[warn] Could not resolve location via geocode/IP; keeping provided context.", file=sys.stderr)
-        return context
+    import asyncio
 
-    lat, lon, label = coords
-    weather = fetch_weather_context(api_key, lat, lon, args.weather_lang, label)
+    weather = asyncio.run(lookup_weather(api_key, args))
     if not weather:
-        print("[warn] Weather lookup failed; keeping provided context.", file=sys.stderr)
         return context
 
     return WeatherContext(
@@ -312,26 +541,17 @@ def current_local_time() -> str:
     return time_str.lstrip("0")
 
 
+@lru_cache(maxsize=16)
 def pick_base_size(target_width: int, target_height: int) -> tuple[int, int, str]:
     target_ratio = target_width / target_height
-    best: tuple[float, int, str, int, int] | None = None
-
-    for size in ALLOWED_SIZES:
-        width_str, height_str = size.split("x")
-        width = int(width_str)
-        height = int(height_str)
-        ratio = width / height
-        ratio_diff = abs(ratio - target_ratio)
-        area = width * height
-        candidate = (ratio_diff, -area, size, width, height)
-        if best is None or candidate < best:
-            best = candidate
-
-    if best is None:
+    if not _ALLOWED_SIZE_TABLE:
         raise RuntimeError("Failed to determine a valid base size.")
 
-    _, _, size_str, base_width, base_height = best
-    return base_width, base_height, size_str
+    width, height, size_str, _ = min(
+        _ALLOWED_SIZE_TABLE,
+        key=lambda entry: (abs(entry[3] - target_ratio), -entry[0] * entry[1], entry[2]),
+    )
+    return width, height, size_str
 
 
 def generate_image(
@@ -340,7 +560,7 @@ def generate_image(
     base_size: str,
     model: str,
     style: str | None,
-) -> bytes:
+) -> Image.Image:
     kwargs: dict[str, str] = {"size": base_size}
     if style:
         kwargs["style"] = style
@@ -353,14 +573,89 @@ def generate_image(
     image_data = response.data[0].b64_json
     if not image_data:
         raise RuntimeError("No image data returned by OpenAI.")
-    return base64.b64decode(image_data)
+    return decode_image(image_data)
+
+
+def decode_image(image_data: str) -> Image.Image:
+    # BytesIO adopts the decoded bytes without copying; once the pixels are
+    # loaded the compressed payload can be released right away.
+    from PIL import Image
+
+    buffer = BytesIO(base64.b64decode(image_data))
+    image = Image.open(buffer)
+    image.load()
+    buffer.close()
+    return image
+
+
+def resize_with_vips(
+    image: Image.Image, target_width: int, target_height: int, kernel: str
+) -> Image.Image | None:
+    """Resize with libvips, or return None to let Pillow do it.
 
+    libvips only applies the kernel when shrinking. Upscales go through an
+    affine transform with a bicubic (cubic) or bilinear (linear) interpolator,
+    and it has no Lanczos interpolator, so a Lanczos upscale is left to Pillow.
+    """
+    if image.mode not in ("L", "RGB", "RGBA"):
+        return None
+    upscaling = target_width > image.width or target_height > image.height
+    if upscaling and kernel not in ("cubic", "linear"):
+        return None
+    try:
+        import pyvips
+    except (ImportError, OSError):  # pyvips is optional; OSError when libvips is missing
+        return None
 
-def upscale_image(image_bytes: bytes, target_width: int, target_height: int) -> Image.Image:
-    image = Image.open(BytesIO(image_bytes))
+    bands = len(image.getbands())
+    source = pyvips.Image.new_from_memory(image.tobytes(), image.width, image.height, bands, "uchar")
+    resized = source.resize(
+        target_width / image.width,
+        vscale=target_height / image.height,
+        kernel=kernel,
+    )
+    if resized.width != target_width or resized.height != target_height:
+        return None
+    from PIL import Image
+
+    return Image.frombytes(image.mode, (target_width, target_height), resized.write_to_memory())
+
+
+def upscale_image(
+    image: Image.Image, target_width: int, target_height: int, resample: str = "bicubic"
+) -> Image.Image:
     if image.width == target_width and image.height == target_height:
         return image
-    return image.resize((target_width, target_height), Image.LANCZOS)
+    pil_filter, vips_kernel = RESAMPLE_FILTERS[resample]
+    resized = resize_with_vips(image, target_width, target_height, vips_kernel)
+    if resized is not None:
+        return resized
+
+    from PIL import Image
+
+    return image.resize((target_width, target_height), getattr(Image, pil_filter))
+
+
+def output_target(output_path: str | None, requested: str | None) -> tuple[str, str]:
+    """Resolve (path, format) so the file extension never disagrees with the encoded format."""
+    if output_path is None:
+        image_format = requested or "png"
+        return f"background.{image_format}", image_format
+    extension = Path(output_path).suffix.lower().lstrip(".")
+    if extension == "jpeg":
+        extension = "jpg"
+    if extension not in OUTPUT_FORMATS:
+        return output_path, requested or "png"
+    if requested and requested != extension:
+        raise ValueError(f"--format {requested} does not match the extension of --output {output_path}")
+    return output_path, extension
+
+
+def save_image(image: Image.Image, output_path: str, image_format: str) -> None:
+    pil_format, options = OUTPUT_FORMATS[image_format]
+    if pil_format == "JPEG" and image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+    image.save(output_path, format=pil_format, **options)
 
 
 def assemble_config(args: argparse.Namespace, ctx: WeatherContext) -> GenerationConfig:
@@ -377,6 +672,8 @@ def assemble_config(args: argparse.Namespace, ctx: WeatherContext) -> Generation
         model=args.model,
         style=args.style,
         skip_upscale=args.skip_upscale,
+        resample=args.resample,
+        image_format=args.format,
     )
 
 
@@ -408,6 +705,9 @@ def main() -> None:
     context = auto_fill_context(weather_api_key, args, context)
 
     config = assemble_config(args, context)
+
+    from openai import OpenAI
+
     client = OpenAI(api_key=api_key)
 
     print("\n--- Prompt sent to DALL-E ---", file=sys.stderr)
@@ -418,7 +718,7 @@ def main() -> None:
         file=sys.stderr,
     )
 
-    raw_image = generate_image(
+    base_image = generate_image(
         client=client,
         prompt=config.prompt,
         base_size=config.base_size_str,
@@ -427,11 +727,11 @@ def main() -> None:
     )
 
     if config.skip_upscale:
-        final_image = Image.open(BytesIO(raw_image))
+        final_image = base_image
     else:
-        final_image = upscale_image(raw_image, config.target_width, config.target_height)
+        final_image = upscale_image(base_image, config.target_width, config.target_height, config.resample)
 
-    final_image.save(config.output_path)
+    save_image(final_image, config.output_path, config.image_format)
     print(
         f"Saved {config.output_path} at {final_image.width}x{final_image.height} (base {config.base_size_str}).",
         file=sys.stderr,
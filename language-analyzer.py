@@ -1,21 +1,124 @@
 #!/usr/bin/env python3
 
 import os
+import re
+import mmap
 import sys
 import argparse
-import subprocess
-import venv
-import tempfile
 from pathlib import Path
-from collections import defaultdict, Counter
+from collections import Counter
 
 SCRIPT_DIR = Path(__file__).parent
 VENV_DIR = SCRIPT_DIR / '.venv_language_analyzer'
 REQUIREMENTS = ['matplotlib>=3.0.0']
+READ_CHUNK_SIZE = 1024 * 1024
+# Files above this size are mapped into memory instead of read in chunks
+MMAP_MIN_SIZE = 1024 * 1024
+# Files above this size, or with a NUL byte near the start, are treated as binary (0 lines)
+MAX_TEXT_FILE_SIZE = 10_000_000
+BINARY_SNIFF_SIZE = 8192
+# Directories that hold dependencies, VCS data or build output rather than source
+DEFAULT_EXCLUDES = {'.git', 'node_modules', '__pycache__', '.venv', 'venv', 'dist', 'build',
+                    'target', '.mypy_cache', '.tox'}
+# Below this many files a worker pool costs more to start than it saves
+PARALLEL_MIN_FILES = 256
+# A line counts when it holds at least one non-whitespace byte.
+NON_BLANK_LINE = re.compile(rb'^[^\S\n]*\S', re.MULTILINE)
+
+# Lower-cased file extension -> language, built once instead of per file
+EXTENSION_LANGUAGES = {
+    '.py': 'Python',
+    '.js': 'JavaScript',
+    '.ts': 'TypeScript',
+    '.jsx': 'JavaScript',
+    '.tsx': 'TypeScript',
+    '.java': 'Java',
+    '.c': 'C',
+    '.cpp': 'C++',
+    '.cc': 'C++',
+    '.cxx': 'C++',
+    '.h': 'C/C++',
+    '.hpp': 'C++',
+    '.cs': 'C#',
+    '.php': 'PHP',
+    '.rb': 'Ruby',
+    '.go': 'Go',
+    '.rs': 'Rust',
+    '.swift': 'Swift',
+    '.kt': 'Kotlin',
+    '.scala': 'Scala',
+    '.r': 'R',
+    '.m': 'Objective-C',
+    '.mm': 'Objective-C++',
+    '.pl': 'Perl',
+    '.lua': 'Lua',
+    '.sh': 'Shell',
+    '.bash': 'Shell',
+    '.zsh': 'Shell',
+    '.fish': 'Shell',
+    '.ps1': 'PowerShell',
+    '.html': 'HTML',
+    '.htm': 'HTML',
+    '.css': 'CSS',
+    '.scss': 'SCSS',
+    '.sass': 'Sass',
+    '.less': 'Less',
+    '.xml': 'XML',
+    '.json': 'JSON',
+    '.yaml': 'YAML',
+    '.yml': 'YAML',
+    '.toml': 'TOML',
+    '.ini': 'INI',
+    '.cfg': 'Config',
+    '.conf': 'Config',
+    '.sql': 'SQL',
+    '.md': 'Markdown',
+    '.txt': 'Text',
+    '.log': 'Log',
+    '.dockerfile': 'Dockerfile',
+    '.makefile': 'Makefile',
+    '.cmake': 'CMake',
+    '.gradle': 'Gradle',
+    '.maven': 'Maven',
+    '.vim': 'Vim',
+    '.el': 'Emacs Lisp',
+    '.lisp': 'Lisp',
+    '.clj': 'Clojure',
+    '.hs': 'Haskell',
+    '.ml': 'OCaml',
+    '.fs': 'F#',
+    '.erl': 'Erlang',
+    '.ex': 'Elixir',
+    '.dart': 'Dart',
+    '.jl': 'Julia',
+    '.nim': 'Nim',
+    '.zig': 'Zig',
+    '.v': 'V',
+    '.d': 'D',
+    '.pas': 'Pascal',
+    '.ada': 'Ada',
+    '.f90': 'Fortran',
+    '.f95': 'Fortran',
+    '.f03': 'Fortran',
+    '.f08': 'Fortran',
+    '.cob': 'COBOL',
+    '.asm': 'Assembly',
+    '.s': 'Assembly',
+}
+
+# Files recognised by their full name rather than an extension
+SPECIAL_FILENAMES = {
+    'dockerfile': 'Dockerfile',
+    'makefile': 'Makefile',
+    'cmakelists.txt': 'CMake',
+}
 
 def ensure_venv():
     """Create and activate virtual environment if it doesn't exist."""
     if not VENV_DIR.exists():
+        import subprocess
+        import venv
+        
         print("Creating virtual environment...")
         venv.create(VENV_DIR, with_pip=True)
         
@@ -43,6 +146,9 @@ def ensure_venv():
 
 def import_matplotlib():
     """Import matplotlib with fallback handling."""
+    if 'matplotlib.pyplot' in sys.modules:
+        return sys.modules['matplotlib.pyplot']
+    
     try:
         import matplotlib
         matplotlib.use('Agg')  # Use non-interactive backend
@@ -59,143 +165,131 @@ def import_matplotlib():
             print("Error: Could not install or import matplotlib")
             return None
 
-def get_language_by_extension(file_path):
+def get_language_by_extension(file_name):
     """Determine programming language based on file extension."""
-    ext_to_lang = {
-        '.py': 'Python',
-        '.js': 'JavaScript',
-        '.ts': 'TypeScript',
-        '.jsx': 'JavaScript',
-        '.tsx': 'TypeScript',
-        '.java': 'Java',
-        '.c': 'C',
-        '.cpp': 'C++',
-        '.cc': 'C++',
-        '.cxx': 'C++',
-        '.h': 'C/C++',
-        '.hpp': 'C++',
-        '.cs': 'C#',
-        '.php': 'PHP',
-        '.rb': 'Ruby',
-        '.go': 'Go',
-        '.rs': 'Rust',
-        '.swift': 'Swift',
-        '.kt': 'Kotlin',
-        '.scala': 'Scala',
-        '.r': 'R',
-        '.m': 'Objective-C',
-        '.mm': 'Objective-C++',
-        '.pl': 'Perl',
-        '.lua': 'Lua',
-        '.sh': 'Shell',
-        '.bash': 'Shell',
-        '.zsh': 'Shell',
-        '.fish': 'Shell',
-        '.ps1': 'PowerShell',
-        '.html': 'HTML',
-        '.htm': 'HTML',
-        '.css': 'CSS',
-        '.scss': 'SCSS',
-        '.sass': 'Sass',
-        '.less': 'Less',
-        '.xml': 'XML',
-        '.json': 'JSON',
-        '.yaml': 'YAML',
-        '.yml': 'YAML',
-        '.toml': 'TOML',
-        '.ini': 'INI',
-        '.cfg': 'Config',
-        '.conf': 'Config',
-        '.sql': 'SQL',
-        '.md': 'Markdown',
-        '.txt': 'Text',
-        '.log': 'Log',
-        '.dockerfile': 'Dockerfile',
-        '.makefile': 'Makefile',
-        '.cmake': 'CMake',
-        '.gradle': 'Gradle',
-        '.maven': 'Maven',
-        '.vim': 'Vim',
-        '.el': 'Emacs Lisp',
-        '.lisp': 'Lisp',
-        '.clj': 'Clojure',
-        '.hs': 'Haskell',
-        '.ml': 'OCaml',
-        '.fs': 'F#',
-        '.erl': 'Erlang',
-        '.ex': 'Elixir',
-        '.dart': 'Dart',
-        '.jl': 'Julia',
-        '.nim': 'Nim',
-        '.zig': 'Zig',
-        '.v': 'V',
-        '.d': 'D',
-        '.pas': 'Pascal',
-        '.ada': 'Ada',
-        '.f90': 'Fortran',
-        '.f95': 'Fortran',
-        '.f03': 'Fortran',
-        '.f08': 'Fortran',
-        '.cob': 'COBOL',
-        '.asm': 'Assembly',
-        '.s': 'Assembly',
-    }
-    
-    extension = file_path.suffix.lower()
+    name = file_name.lower()
     
     # Handle special cases
-    if file_path.name.lower() in ['dockerfile', 'makefile', 'cmakelists.txt']:
-        return file_path.name.lower().title()
+    language = SPECIAL_FILENAMES.get(name)
+    if language:
+        return language
     
-    return ext_to_lang.get(extension, 'Other')
+    return EXTENSION_LANGUAGES.get(os.path.splitext(name)[1], 'Other')
 
 def count_lines_in_file(file_path):
     """Count non-empty lines in a file."""
+    count = 0
     try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            lines = [line.strip() for line in f if line.strip()]
-            return len(lines)
+        # Unbuffered: reads are already large chunks, so a BufferedReader would only add a copy
+        with open(file_path, 'rb', buffering=0) as f:
+            size = os.fstat(f.fileno()).st_size
+            if size > MAX_TEXT_FILE_SIZE:
+                return 0
+            if size > MMAP_MIN_SIZE:
+                return count_lines_in_mapping(f.fileno())
+            head = f.read(BINARY_SNIFF_SIZE)
+            if b'\x00' in head:
+                return 0
+            partial = head
+            while True:
+                chunk = f.read(READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                data = partial + chunk
+                # Only scan complete lines; the trailing partial line waits for the next chunk
+                end = data.rfind(b'\n') + 1
+                count += sum(1 for _ in NON_BLANK_LINE.finditer(data, 0, end))
+                partial = data[end:]
     except (IOError, OSError):
         return 0
+    return count + sum(1 for _ in NON_BLANK_LINE.finditer(partial))
+
+def count_lines_in_mapping(fd):
+    """Count non-empty lines of a large file by scanning a read-only memory map."""
+    with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mapped:
+        if mapped.find(b'\x00', 0, BINARY_SNIFF_SIZE) != -1:
+            return 0
+        # finditer, not findall: no bytes object is kept per matching line
+        return sum(1 for _ in NON_BLANK_LINE.finditer(mapped))
 
-def analyze_directory(directory_path):
+def analyze_file(file_path, file_name):
+    """Return the language and non-empty line count for a single file."""
+    return get_language_by_extension(file_name), count_lines_in_file(file_path)
+
+def iter_files(directory, excludes=DEFAULT_EXCLUDES, include_hidden=False):
+    """Yield (path, name) for every regular file below directory, pruning excluded directories."""
+    pending = [directory]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    # DirEntry caches the file type from readdir, so no extra stat per entry
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name in excludes or (not include_hidden and entry.name.startswith('.')):
+                            continue
+                        pending.append(entry.path)
+                    elif entry.is_file():
+                        yield entry.path, entry.name
+        except OSError:
+            continue
+
+def default_jobs():
+    """Number of CPUs this process may run on."""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+def analyze_directory(directory_path, jobs=None, excludes=DEFAULT_EXCLUDES, include_hidden=False):
     """Analyze directory and return language statistics."""
-    directory = Path(directory_path)
-    
-    if not directory.exists():
+    if not os.path.exists(directory_path):
         print(f"Error: Directory '{directory_path}' does not exist.")
         return None
     
-    if not directory.is_dir():
+    if not os.path.isdir(directory_path):
         print(f"Error: '{directory_path}' is not a directory.")
         return None
     
-    lang_stats = defaultdict(lambda: {'files': 0, 'lines': 0})
-    other_extensions = defaultdict(lambda: {'files': 0, 'lines': 0})
+    # Per-language and per-extension (for "Other") file and line tallies
+    lang_files, lang_lines = Counter(), Counter()
+    ext_files, ext_lines = Counter(), Counter()
     total_files = 0
     total_lines = 0
     
     # Walk through all files in directory and subdirectories
-    for file_path in directory.rglob('*'):
-        if file_path.is_file():
-            language = get_language_by_extension(file_path)
-            line_count = count_lines_in_file(file_path)
-            
-            lang_stats[language]['files'] += 1
-            lang_stats[language]['lines'] += line_count
-            total_files += 1
-            total_lines += line_count
-            
-            # Track extensions for "Other" category
-            if language == 'Other':
-                ext = file_path.suffix.lower() if file_path.suffix else '(no extension)'
-                other_extensions[ext]['files'] += 1
-                other_extensions[ext]['lines'] += line_count
-    
-    return dict(lang_stats), dict(other_extensions), total_files, total_lines
+    file_paths, file_names = [], []
+    for file_path, file_name in iter_files(directory_path, excludes, include_hidden):
+        file_paths.append(file_path)
+        file_names.append(file_name)
+    
+    # Counting is independent per file, so large trees are spread across processes
+    if jobs is None:
+        jobs = default_jobs()
+    if jobs > 1 and len(file_paths) >= PARALLEL_MIN_FILES:
+        from concurrent.futures import ProcessPoolExecutor
+        
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(analyze_file, file_paths, file_names, chunksize=64))
+    else:
+        results = list(map(analyze_file, file_paths, file_names))
+    
+    for file_name, (language, line_count) in zip(file_names, results):
+        lang_files[language] += 1
+        lang_lines[language] += line_count
+        total_files += 1
+        total_lines += line_count
+        
+        # Track extensions for "Other" category
+        if language == 'Other':
+            ext = os.path.splitext(file_name)[1].lower() or '(no extension)'
+            ext_files[ext] += 1
+            ext_lines[ext] += line_count
+    
+    return (lang_files, lang_lines), (ext_files, ext_lines), total_files, total_lines
 
 def print_statistics(lang_stats, other_extensions, total_files, total_lines):
     """Print detailed statistics."""
+    lang_files, lang_lines = lang_stats
+    ext_files, ext_lines = other_extensions
     print(f"\n{'='*60}")
     print(f"DIRECTORY ANALYSIS RESULTS")
     print(f"{'='*60}")
@@ -203,36 +297,32 @@ def print_statistics(lang_stats, other_extensions, total_files, total_lines):
     print(f"Total Lines: {total_lines:,}")
     print(f"{'='*60}")
     
-    # Sort by line count (descending)
-    sorted_langs = sorted(lang_stats.items(), key=lambda x: x[1]['lines'], reverse=True)
-    
     print(f"{'Language':<20} {'Files':<10} {'Lines':<15} {'% of Lines':<10}")
     print(f"{'-'*60}")
     
-    for lang, stats in sorted_langs:
-        percentage = (stats['lines'] / total_lines * 100) if total_lines > 0 else 0
-        print(f"{lang:<20} {stats['files']:<10} {stats['lines']:<15,} {percentage:<10.1f}%")
+    # Sorted by line count (descending)
+    for lang, lines in lang_lines.most_common():
+        percentage = (lines / total_lines * 100) if total_lines > 0 else 0
+        print(f"{lang:<20} {lang_files[lang]:<10} {lines:<15,} {percentage:<10.1f}%")
     
     # Show breakdown of "Other" category if it exists
-    if 'Other' in lang_stats and other_extensions:
+    if 'Other' in lang_lines and ext_lines:
         print(f"\n{'='*60}")
         print(f"BREAKDOWN OF 'OTHER' CATEGORY")
         print(f"{'='*60}")
         
-        # Sort by line count (descending)
-        sorted_others = sorted(other_extensions.items(), key=lambda x: x[1]['lines'], reverse=True)
-        
         print(f"{'Extension':<20} {'Files':<10} {'Lines':<15} {'% of Other':<10}")
         print(f"{'-'*60}")
         
-        other_total_lines = lang_stats['Other']['lines']
-        for ext, stats in sorted_others:
-            percentage = (stats['lines'] / other_total_lines * 100) if other_total_lines > 0 else 0
-            print(f"{ext:<20} {stats['files']:<10} {stats['lines']:<15,} {percentage:<10.1f}%")
+        other_total_lines = lang_lines['Other']
+        for ext, lines in ext_lines.most_common():
+            percentage = (lines / other_total_lines * 100) if other_total_lines > 0 else 0
+            print(f"{ext:<20} {ext_files[ext]:<10} {lines:<15,} {percentage:<10.1f}%")
 
 def create_pie_chart(lang_stats, total_lines, output_path=None):
     """Create a pie chart showing language distribution by lines of code."""
-    if not lang_stats:
+    _, lang_lines = lang_stats
+    if not lang_lines:
         print("No data to create pie chart.")
         return
     
@@ -241,17 +331,19 @@ def create_pie_chart(lang_stats, total_lines, output_path=None):
         print("Skipping pie chart generation - matplotlib not available")
         return
     
+    # numpy is always installed alongside matplotlib
+    import numpy as np
+    
     # Filter out languages with very small percentages for better visualization
     min_percentage = 1.0
-    significant_langs = {}
-    other_lines = 0
-    
-    for lang, stats in lang_stats.items():
-        percentage = (stats['lines'] / total_lines * 100) if total_lines > 0 else 0
-        if percentage >= min_percentage:
-            significant_langs[lang] = stats['lines']
-        else:
-            other_lines += stats['lines']
+    languages = list(lang_lines)
+    counts = np.fromiter(lang_lines.values(), dtype=np.int64, count=len(languages))
+    if total_lines > 0:
+        significant = counts * 100.0 / total_lines >= min_percentage
+    else:
+        significant = np.zeros(len(languages), dtype=bool)
+    significant_langs = {languages[i]: int(counts[i]) for i in np.flatnonzero(significant)}
+    other_lines = int(counts[~significant].sum())
     
     if other_lines > 0:
         significant_langs['Other'] = other_lines
@@ -288,6 +380,7 @@ def create_pie_chart(lang_stats, total_lines, output_path=None):
         print(f"\nPie chart saved to: {output_path}")
     else:
         # Save to temporary directory since we're using non-interactive backend
+        import tempfile
         temp_dir = tempfile.gettempdir()
         default_path = Path(temp_dir) / 'language_distribution.png'
         plt.savefig(default_path, dpi=300, bbox_inches='tight')
@@ -300,11 +393,20 @@ def main():
     parser.add_argument('directory', nargs='?', default='.', help='Directory to analyze (default: current directory)')
     parser.add_argument('-o', '--output', help='Output file for pie chart (PNG format)')
     parser.add_argument('--no-chart', action='store_true', help='Skip generating pie chart')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='Worker processes for line counting (default: CPU count, 1 disables)')
+    parser.add_argument('--exclude', action='append', default=[], metavar='DIR',
+                        help='Additional directory name to skip (repeatable)')
+    parser.add_argument('--no-default-excludes', action='store_true',
+                        help=f"Do not skip {', '.join(sorted(DEFAULT_EXCLUDES))}")
+    parser.add_argument('--include-hidden', action='store_true',
+                        help='Descend into hidden directories (names starting with a dot)')
     
     args = parser.parse_args()
     
     # Analyze directory
-    result = analyze_directory(args.directory)
+    excludes = set(args.exclude) if args.no_default_excludes else DEFAULT_EXCLUDES | set(args.exclude)
+    result = analyze_directory(args.directory, args.jobs, excludes, args.include_hidden)
     if result is None:
         sys.exit(1)
     
@@ -9,6 +9,8 @@ Minimal streaming voice assistant:
 from __future__ import annotations
 
 import argparse
+import math
+import os
 import queue
 import re
 import subprocess
@@ -16,12 +18,28 @@ import sys
 import threading
 import time
 import unicodedata
+from collections import deque
 from typing import Optional, Sequence
 
 import numpy as np
 import soundcard as sc
 from faster_whisper import WhisperModel
 
+# Longest audio handed to one transcribe call when coalescing a backlog.
+BATCH_WINDOW_SECONDS = 28.0
+# Audio kept ahead of an utterance; the capture gate forwards the same pre-roll.
+TAIL_SECONDS = 0.8
+# Extra post-roll forwarded by the capture gate beyond --silence-hold.
+GATE_HANG_SECONDS = 0.25
+# Queued when the capture gate closes, so the worker closes open segments.
+GATE_CLOSED = np.zeros(0, dtype=np.float32)
+# Requested (best effort, needs CAP_SYS_NICE) for the capture thread.
+CAPTURE_NICENESS = -5
+# Trailing committed text passed as initial_prompt to keep context across calls.
+PROMPT_CHARS = 200
+# webrtcvad accepts 10, 20 or 30 ms frames.
+VAD_FRAME_SECONDS = 0.03
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
@@ -73,6 +91,13 @@ def parse_args() -> argparse.Namespace:
         default=0.8,
         help="Minimum speech duration required before transcribing a segment.",
     )
+    parser.add_argument(
+        "--vad-aggressiveness",
+        type=int,
+        default=2,
+        choices=(-1, 0, 1, 2, 3),
+        help="webrtcvad aggressiveness used on top of the RMS gate (-1 disables; needs webrtcvad).",
+    )
     parser.add_argument(
         "--device",
         default="auto",
@@ -118,18 +143,140 @@ def pick_microphone(device: str | None) -> sc.Microphone:
     raise SystemExit(f"No microphone matching '{device}'. Available: {available}")
 
 
+def pick_device(device: str, compute_type: str) -> tuple[str, str]:
+    """Resolve --device auto without paying for a failed CUDA load on CPU-only hosts."""
+    if device != "auto":
+        return device, compute_type
+    try:
+        import ctranslate2
+
+        if ctranslate2.get_cuda_device_count() > 0:
+            return "cuda", compute_type
+        supported = ctranslate2.get_supported_compute_types("cpu")
+    except Exception:  # noqa: BLE001
+        return "cuda", compute_type
+    return "cpu", compute_type if compute_type in supported else "int8"
+
+
+def split_cpus() -> tuple[set[int], set[int]]:
+    """Reserve one CPU for audio capture and leave the rest to transcription."""
+    try:
+        cpus = sorted(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        return set(), set()
+    if len(cpus) < 2:
+        return set(), set()
+    return {cpus[-1]}, set(cpus[:-1])
+
+
+def tune_current_thread(cpus: set[int], niceness: int = 0) -> None:
+    """Best-effort CPU affinity and nice value for the calling thread (Linux applies both per thread)."""
+    if cpus:
+        try:
+            os.sched_setaffinity(0, cpus)
+        except (AttributeError, OSError):
+            pass
+    if niceness:
+        try:
+            os.nice(niceness)
+        except OSError:
+            pass
+
+
+def make_vad(aggressiveness: int):
+    if aggressiveness < 0:
+        return None
+    try:
+        import webrtcvad
+    except ImportError:
+        return None
+    return webrtcvad.Vad(aggressiveness)
+
+
+def vad_has_speech(vad, samples: np.ndarray, sample_rate: int) -> bool:
+    frame = int(sample_rate * VAD_FRAME_SECONDS)
+    usable = len(samples) - len(samples) % frame
+    if not usable:
+        return True
+    pcm = (samples[:usable] * 32767.0).astype(np.int16).tobytes()
+    step = frame * 2
+    return any(vad.is_speech(pcm[i : i + step], sample_rate) for i in range(0, len(pcm), step))
+
+
 def type_with_ydotool(text: str) -> None:
     subprocess.run(["ydotool", "type", text], check=True)
 
 
+class YdotoolTyper:
+    """Streams text into one long-lived `ydotool type --file -` process.
+
+    Falls back to one ydotool call per text if the streaming process cannot
+    be started or dies.
+    """
+
+    def __init__(self) -> None:
+        self._proc: subprocess.Popen[bytes] | None = None
+        self._streaming = True
+
+    def _spawn(self) -> subprocess.Popen[bytes] | None:
+        try:
+            proc = subprocess.Popen(["ydotool", "type", "--file", "-"], stdin=subprocess.PIPE)
+        except OSError:
+            self._streaming = False
+            return None
+        try:
+            proc.wait(timeout=0.05)
+        except subprocess.TimeoutExpired:
+            return proc
+        # Exited straight away: this ydotool cannot read from stdin.
+        self._streaming = False
+        return None
+
+    def type(self, text: str) -> None:
+        if self._streaming and (self._proc is None or self._proc.poll() is not None):
+            self._proc = self._spawn()
+        if self._proc is None or self._proc.stdin is None:
+            type_with_ydotool(text)
+            return
+        try:
+            self._proc.stdin.write(text.encode("utf-8"))
+            self._proc.stdin.flush()
+        except OSError:
+            self.close()
+            type_with_ydotool(text)
+
+    def close(self) -> None:
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        try:
+            if proc.stdin is not None:
+                proc.stdin.close()
+            proc.wait(timeout=2.0)
+        except (OSError, subprocess.TimeoutExpired):
+            proc.kill()
+
+
+def word_key(word: str) -> str:
+    return re.sub(r"[^\w]", "", word.casefold())
+
+
 def delta_text(current: str, previous: str) -> str:
-    current = current.strip()
-    previous = previous.strip()
-    if not previous:
-        return current
-    if current.startswith(previous):
-        return current[len(previous) :].strip()
-    return current
+    """Drop the leading words of current that repeat the end of previous.
+
+    Words are compared case- and punctuation-insensitively. A one-word overlap
+    only counts when it is all of previous, so common short words at a boundary
+    are not swallowed.
+    """
+    tokens = current.split()
+    keys = [word_key(token) for token in tokens]
+    previous_keys = [word_key(token) for token in previous.split()]
+    for size in range(min(len(keys), len(previous_keys)), 0, -1):
+        if size < 2 and size != len(previous_keys):
+            break
+        if previous_keys[-size:] == keys[:size]:
+            return " ".join(tokens[size:])
+    return " ".join(tokens)
 
 
 def clean_text(text: str) -> str:
@@ -141,9 +288,113 @@ def clean_text(text: str) -> str:
     return text.strip()
 
 
+class SampleBuffer:
+    """Growable float32 sample buffer reused across segments.
+
+    Live samples sit between a start and end cursor, so dropping old audio only
+    moves the start cursor; samples are compacted to the front when the end of
+    the array is reached.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self._data = np.empty(capacity, dtype=np.float32)
+        self._start = 0
+        self._end = 0
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def append(self, samples: np.ndarray) -> None:
+        count = len(samples)
+        if self._end + count > len(self._data):
+            live = len(self)
+            if live + count > len(self._data):
+                grown = np.empty(max(live + count, 2 * len(self._data)), dtype=np.float32)
+                grown[:live] = self._data[self._start : self._end]
+                self._data = grown
+            else:
+                self._data[:live] = self._data[self._start : self._end]
+            self._start, self._end = 0, live
+        self._data[self._end : self._end + count] = samples
+        self._end += count
+
+    def keep_last(self, count: int) -> None:
+        self._start = max(self._start, self._end - count)
+
+    def clear(self) -> None:
+        self._start = self._end = 0
+
+    def view(self) -> np.ndarray:
+        return self._data[self._start : self._end]
+
+
+TRANSCRIBE_OPTIONS = {
+    "beam_size": 1,
+    "best_of": 1,
+    # Greedy first; only windows that trip the thresholds below are re-decoded warmer.
+    "temperature": [0.0, 0.2, 0.4],
+    "condition_on_previous_text": True,
+    "compression_ratio_threshold": 2.3,
+    "log_prob_threshold": -1.0,
+    "no_speech_threshold": 0.6,
+    "vad_filter": True,
+    "vad_parameters": {"min_silence_duration_ms": 300},
+}
+
+
+def transcribe_segments(model: WhisperModel, audio: np.ndarray, language: Optional[str], **options) -> list:
+    segments, _info = model.transcribe(audio, language=language, **{**TRANSCRIBE_OPTIONS, **options})
+    return list(segments)
+
+
+def warm_up(model: WhisperModel, sample_rate: int, language: Optional[str]) -> None:
+    """Run the first (slow) calls on silence so the first utterance doesn't pay for them."""
+    silence = np.zeros(sample_rate, dtype=np.float32)
+    try:
+        # Loads the Silero VAD model; the silence is filtered out before the encoder.
+        transcribe_segments(model, silence, language)
+        # Runs the encoder, decoder and word alignment once.
+        transcribe_segments(model, silence, language, vad_filter=False, word_timestamps=True)
+    except Exception as exc:  # noqa: BLE001
+        print(f"[warn] Warm-up transcription failed: {exc}", file=sys.stderr)
+
+
+def transcribe_text(
+    model: WhisperModel, audio: np.ndarray, language: Optional[str], prompt: Optional[str] = None
+) -> str:
+    segments = transcribe_segments(model, audio, language, initial_prompt=prompt or None)
+    texts: Sequence[str] = [seg.text for seg in segments]
+    return clean_text(" ".join(texts))
+
+
+def transcribe_words(
+    model: WhisperModel, audio: np.ndarray, language: Optional[str], prompt: Optional[str] = None
+) -> list[tuple[str, float]]:
+    """Return (word, end_seconds) pairs for the audio."""
+    segments = transcribe_segments(
+        model, audio, language, word_timestamps=True, initial_prompt=prompt or None
+    )
+    return [
+        (word.word.strip(), word.end)
+        for seg in segments
+        for word in (seg.words or ())
+        if word.word.strip()
+    ]
+
+
+def agreed_prefix(words: list[tuple[str, float]], previous: list[tuple[str, float]]) -> int:
+    """Number of leading words two successive hypotheses agree on (LocalAgreement-2)."""
+    count = 0
+    for (word, _end), (prev, _prev_end) in zip(words, previous):
+        if word_key(word) != word_key(prev):
+            break
+        count += 1
+    return count
+
+
 def transcription_worker(
-    audio_q: "queue.Queue[bytes]",
-    typing_q: "queue.Queue[str]",
+    audio_q: "queue.SimpleQueue[np.ndarray]",
+    typing_q: "queue.SimpleQueue[str]",
     stop_event: threading.Event,
     model: WhisperModel,
     sample_rate: int,
@@ -154,150 +405,202 @@ def transcription_worker(
     min_speech_seconds: float,
     max_chunk_seconds: float,
     debug: bool,
+    vad=None,
+    free_blocks: "queue.SimpleQueue[np.ndarray] | None" = None,
+    cpus: set[int] | None = None,
 ) -> None:
-    bytes_per_sample = 2  # int16
-    buffer = bytearray()
+    if cpus:
+        tune_current_thread(cpus)
     last_text = ""
-    tail_seconds = 0.8
-    tail_bytes_keep = int(sample_rate * tail_seconds * bytes_per_sample)
+    # Tail of everything typed so far, passed to Whisper as initial_prompt.
+    prompt = ""
+    tail_samples_keep = int(sample_rate * TAIL_SECONDS)
+    # Whisper pads every call to a 30 s window, so utterances that closed while
+    # a backlog was queued are transcribed together in one call of up to this length.
+    batch_samples = int(sample_rate * BATCH_WINDOW_SECONDS)
+    buffer = SampleBuffer(batch_samples + int(sample_rate * (silence_hold + TAIL_SECONDS + 1.0)))
+    # Compare mean-square energy against threshold^2 so the gate needs no sqrt.
+    energy_threshold = rms_threshold * rms_threshold
     speech_active = False
     silence_accum = 0.0
     speech_accum = 0.0
+    pending = False
+    # Uncommitted words from the last pass over a still-running utterance.
+    hypothesis: list[tuple[str, float]] = []
     flush_started: float | None = None
 
+    def emit(text: str, duration: float, label: str) -> None:
+        nonlocal last_text, prompt
+        if not text or len(text) < min_text_len:
+            return
+        new_text = delta_text(text, last_text)
+        if not new_text and text == last_text:
+            new_text = " "
+        if not new_text:
+            return
+        if not new_text.endswith(" "):
+            new_text = f"{new_text} "
+        if debug:
+            latency = (time.time() - flush_started) if flush_started else 0.0
+            print(
+                f"[debug] {label}={duration:.2f}s latency={latency:.2f}s raw='{text}' delta='{new_text}'",
+                file=sys.stderr,
+            )
+        typing_q.put(new_text)
+        last_text = text
+        prompt = f"{prompt}{new_text}"[-PROMPT_CHARS:]
+
     while not stop_event.is_set() or not audio_q.empty():
         try:
             chunk = audio_q.get(timeout=0.3)
         except queue.Empty:
             continue
-        buffer.extend(chunk)
-        if not chunk:
-            continue
-
-        block_duration = len(chunk) / (bytes_per_sample * sample_rate)
-        block_np = np.frombuffer(chunk, dtype=np.int16).astype(np.float32) / 32768.0
-        block_rms = float(np.sqrt(np.mean(np.square(block_np)))) if block_np.size else 0.0
-
-        if block_rms >= rms_threshold:
+        if not chunk.size:
+            # Capture gate closed: end the open utterance and flush deferred ones.
+            if not speech_active and not pending:
+                continue
+            is_speech = False
+            block_duration = 0.0
+            silence_accum = max(silence_accum, silence_hold)
+        else:
+            buffer.append(chunk)
+            block_duration = len(chunk) / sample_rate
+            block_energy = float(np.dot(chunk, chunk))
+
+            is_speech = block_energy >= energy_threshold * len(chunk)
+            if is_speech and vad is not None:
+                # Loud but voiceless blocks (fans, typing, clicks) don't open a segment.
+                is_speech = vad_has_speech(vad, chunk, sample_rate)
+            if free_blocks is not None:
+                free_blocks.put(chunk)
+
+        if is_speech:
             speech_active = True
             speech_accum += block_duration
             silence_accum = 0.0
-        else:
-            if speech_active:
-                silence_accum += block_duration
-            else:
-                if tail_bytes_keep > 0 and len(buffer) > tail_bytes_keep:
-                    buffer = bytearray(buffer[-tail_bytes_keep:])
+        elif speech_active:
+            silence_accum += block_duration
+        elif pending:
+            # Keep deferred utterances until the backlog drains.
+            if not audio_q.empty() and len(buffer) < batch_samples:
                 continue
-
-        should_flush = speech_active and (
-            silence_accum >= silence_hold or speech_accum >= max_chunk_seconds
-        )
-        if not should_flush:
+        else:
+            buffer.keep_last(tail_samples_keep)
             continue
 
-        flush_started = time.time()
-
-        audio_np = np.frombuffer(buffer, dtype=np.int16).astype(np.float32) / 32768.0
-        if not audio_np.size or speech_accum < min_speech_seconds:
-            buffer.clear()
+        if speech_active:
+            if silence_accum < silence_hold and speech_accum < max_chunk_seconds:
+                continue
+            if speech_accum < min_speech_seconds and not pending:
+                buffer.clear()
+                speech_active = False
+                silence_accum = 0.0
+                speech_accum = 0.0
+                continue
+            if flush_started is None:
+                flush_started = time.time()
+            if silence_accum < silence_hold and not pending:
+                # Still talking: re-transcribe the growing window and commit only
+                # the words the last two passes agree on, then drop their audio.
+                audio_np = buffer.view()
+                try:
+                    words = transcribe_words(model, audio_np, language, prompt)
+                except Exception as exc:  # noqa: BLE001
+                    print(f"[warn] Transcription failed: {exc}", file=sys.stderr)
+                    words = []
+                agreed = agreed_prefix(words, hypothesis)
+                if not agreed and len(buffer) >= batch_samples:
+                    agreed = max(len(words) - 1, 0)
+                if agreed:
+                    committed = clean_text(" ".join(word for word, _end in words[:agreed]))
+                    cut_seconds = words[agreed - 1][1]
+                    if debug:
+                        latency = time.time() - flush_started
+                        print(
+                            f"[debug] window={len(audio_np) / sample_rate:.2f}s latency={latency:.2f}s committed='{committed}'",
+                            file=sys.stderr,
+                        )
+                    typing_q.put(f"{committed} ")
+                    last_text = committed
+                    prompt = f"{prompt}{committed} "[-PROMPT_CHARS:]
+                    buffer.keep_last(len(buffer) - min(int(cut_seconds * sample_rate), len(buffer)))
+                    hypothesis = [(word, end - cut_seconds) for word, end in words[agreed:]]
+                else:
+                    hypothesis = words
+                # Next pass after half a window of new speech, so passes overlap.
+                speech_accum = max_chunk_seconds / 2
+                flush_started = None
+                continue
             speech_active = False
-            silence_accum = 0.0
-            speech_accum = 0.0
-            continue
+            backlog = audio_q.qsize() * len(chunk)
+            if (
+                silence_accum >= silence_hold
+                and backlog >= min_speech_seconds * sample_rate
+                and len(buffer) + backlog < batch_samples
+            ):
+                # More audio is already waiting; transcribe it with this utterance.
+                pending = True
+                silence_accum = 0.0
+                speech_accum = 0.0
+                continue
 
+        audio_np = buffer.view()
         try:
-            segments, _info = model.transcribe(
-                audio_np,
-                language=language,
-                beam_size=5,
-                temperature=0.0,
-                compression_ratio_threshold=2.3,
-                log_prob_threshold=-1.0,
-                no_speech_threshold=0.6,
-                vad_filter=False,
-            )
-            texts: Sequence[str] = [seg.text for seg in segments]
-            text = clean_text(" ".join(texts))
+            text = transcribe_text(model, audio_np, language, prompt)
         except Exception as exc:  # noqa: BLE001
             print(f"[warn] Transcription failed: {exc}", file=sys.stderr)
             buffer.clear()
-            continue
+            text = ""
+        emit(text, len(audio_np) / sample_rate, "batch" if pending else "segment")
 
-        if text and len(text) >= min_text_len:
-            duration = len(audio_np) / sample_rate
-            new_text = delta_text(text, last_text)
-            if not new_text and text == last_text:
-                new_text = " "
-            if new_text:
-                if not new_text.endswith(" "):
-                    new_text = f"{new_text} "
-                if debug:
-                    latency = (time.time() - flush_started) if flush_started else 0.0
-                    print(
-                        f"[debug] segment={duration:.2f}s latency={latency:.2f}s raw='{text}' delta='{new_text}'",
-                        file=sys.stderr,
-                    )
-                typing_q.put(new_text)
-                last_text = text
-
-        if tail_bytes_keep > 0 and len(buffer) > tail_bytes_keep:
-            buffer = bytearray(buffer[-tail_bytes_keep:])
+        if tail_samples_keep > 0 and len(buffer) > tail_samples_keep:
+            buffer.keep_last(tail_samples_keep)
         else:
             buffer.clear()
 
-        speech_active = False
+        pending = False
+        hypothesis = []
+        flush_started = None
         silence_accum = 0.0
-        speech_accum = float(len(buffer) / (bytes_per_sample * sample_rate))
+        speech_accum = len(buffer) / sample_rate
 
-    if not stop_event.is_set() and buffer and speech_accum >= min_speech_seconds:
+    if len(buffer) and (pending or (speech_active and speech_accum >= min_speech_seconds)):
         try:
-            flush_started = time.time()
-            audio_np = np.frombuffer(buffer, dtype=np.int16).astype(np.float32) / 32768.0
-            segments, _info = model.transcribe(
-                audio_np,
-                language=language,
-                beam_size=5,
-                temperature=0.0,
-                compression_ratio_threshold=2.3,
-                log_prob_threshold=-1.0,
-                no_speech_threshold=0.6,
-                vad_filter=False,
-            )
-            texts: Sequence[str] = [seg.text for seg in segments]
-            text = clean_text(" ".join(texts))
-            if text and len(text) >= min_text_len:
-                duration = len(audio_np) / sample_rate
-                new_text = delta_text(text, last_text)
-                if not new_text and text == last_text:
-                    new_text = " "
-                if new_text:
-                    if not new_text.endswith(" "):
-                        new_text = f"{new_text} "
-                    if debug:
-                        latency = (time.time() - flush_started) if flush_started else 0.0
-                        print(
-                            f"[debug] final_segment={duration:.2f}s latency={latency:.2f}s raw='{text}' delta='{new_text}'",
-                            file=sys.stderr,
-                        )
-                    typing_q.put(new_text)
+            audio_np = buffer.view()
+            emit(transcribe_text(model, audio_np, language, prompt), len(audio_np) / sample_rate, "final_segment")
         except Exception as exc:  # noqa: BLE001
             print(f"[warn] Final transcription failed: {exc}", file=sys.stderr)
 
 
 def typing_worker(
-    typing_q: "queue.Queue[str]",
-    stop_event: threading.Event,
+    typing_q: "queue.SimpleQueue[str]",
+    done_event: threading.Event,
 ) -> None:
-    while not stop_event.is_set() or not typing_q.empty():
-        try:
-            text = typing_q.get(timeout=0.2)
-        except queue.Empty:
-            continue
-        try:
-            type_with_ydotool(text)
-        except Exception as exc:  # noqa: BLE001
-            print(f"[warn] ydotool failed: {exc}", file=sys.stderr)
+    """Type queued text until done_event is set and the queue is drained.
+
+    done_event is set only after the transcriber has exited, so its final
+    flush is typed instead of being dropped on shutdown.
+    """
+    typer = YdotoolTyper()
+    try:
+        while not done_event.is_set() or not typing_q.empty():
+            try:
+                parts = [typing_q.get(timeout=0.2)]
+            except queue.Empty:
+                continue
+            # Type everything that queued up meanwhile in one write.
+            try:
+                while True:
+                    parts.append(typing_q.get_nowait())
+            except queue.Empty:
+                pass
+            text = "".join(parts)
+            try:
+                typer.type(text)
+            except Exception as exc:  # noqa: BLE001
+                print(f"[warn] ydotool failed: {exc}", file=sys.stderr)
+    finally:
+        typer.close()
 
 
 def main() -> None:
@@ -315,17 +618,19 @@ def main() -> None:
         f"Loading faster-whisper model '{args.model}' (device={args.device}, compute_type={args.compute_type})...",
         file=sys.stderr,
     )
-    target_device = "cuda" if args.device == "auto" else args.device
+    target_device, compute_type = pick_device(args.device, args.compute_type)
+    if args.device == "auto" and target_device == "cpu":
+        print(f"[info] No CUDA device found; loading on CPU with compute_type={compute_type}", file=sys.stderr)
     try:
         model = WhisperModel(
             args.model,
             device=target_device,
-            compute_type=args.compute_type,
+            compute_type=compute_type,
         )
     except Exception as exc:  # noqa: BLE001
         if args.device != "auto":
             raise
-        print(f"[warn] CUDA load failed ({exc}); trying CPU...", file=sys.stderr)
+        print(f"[warn] {target_device.upper()} load failed ({exc}); trying CPU...", file=sys.stderr)
         cpu_fallbacks = (args.compute_type, "int8", "float32")
         last_exc: Exception | None = None
         for compute_type in cpu_fallbacks:
@@ -342,10 +647,23 @@ def main() -> None:
         else:
             raise last_exc if last_exc else exc
 
-    audio_q: "queue.Queue[bytes]" = queue.Queue()
-    typing_q: "queue.Queue[str]" = queue.Queue()
+    warm_up(model, sample_rate, args.language)
+
+    vad = make_vad(args.vad_aggressiveness)
+    if vad is None and args.vad_aggressiveness >= 0:
+        print("[info] webrtcvad not installed; using the RMS gate only.", file=sys.stderr)
+
+    audio_q: "queue.SimpleQueue[np.ndarray]" = queue.SimpleQueue()
+    # Blocks cycle between capture and the worker, which hands each one back
+    # once its samples are copied into the segment buffer.
+    free_blocks: "queue.SimpleQueue[np.ndarray]" = queue.SimpleQueue()
+    typing_q: "queue.SimpleQueue[str]" = queue.SimpleQueue()
     stop_event = threading.Event()
 
+    # Keep capture off the cores the transcriber runs on. The model's own
+    # compute threads already exist and keep their affinity.
+    capture_cpus, worker_cpus = split_cpus()
+
     transcriber = threading.Thread(
         target=transcription_worker,
         args=(
@@ -361,12 +679,16 @@ def main() -> None:
             args.min_speech_seconds,
             args.chunk_seconds,
             args.debug,
+            vad,
+            free_blocks,
+            worker_cpus,
         ),
         daemon=True,
     )
+    typing_done = threading.Event()
     typer = threading.Thread(
         target=typing_worker,
-        args=(typing_q, stop_event),
+        args=(typing_q, typing_done),
         daemon=True,
     )
 
@@ -377,6 +699,14 @@ def main() -> None:
 
     transcriber.start()
     typer.start()
+    tune_current_thread(capture_cpus, CAPTURE_NICENESS)
+
+    # Quiet blocks are held back as pre-roll and only forwarded around speech.
+    energy_floor = args.rms_threshold * args.rms_threshold
+    preroll: deque[np.ndarray] = deque(maxlen=math.ceil(TAIL_SECONDS * sample_rate / block_frames))
+    postroll_blocks = math.ceil((args.silence_hold + GATE_HANG_SECONDS) * sample_rate / block_frames)
+    open_blocks = 0
+    mix_weights = np.empty(0, dtype=np.float32)
 
     try:
         with mic.recorder(samplerate=sample_rate, blocksize=block_frames, channels=1) as recorder:
@@ -384,20 +714,52 @@ def main() -> None:
                 data = recorder.record(numframes=block_frames)
                 if data.size == 0:
                     continue
-                samples = data.astype(np.float32)
-                if samples.ndim > 1:
-                    samples = samples.mean(axis=1)
-                samples = np.clip(samples, -1.0, 1.0)
-                audio_bytes = (samples * 32768.0).astype(np.int16).tobytes()
-                audio_q.put(audio_bytes)
-                time.sleep(0.01)
+                n = len(data)
+                try:
+                    block = free_blocks.get_nowait()
+                except queue.Empty:
+                    block = np.empty(block_frames, dtype=np.float32)
+                if n > len(block):
+                    block = np.empty(n, dtype=np.float32)
+                samples = block[:n]
+                if data.ndim > 1 and data.shape[1] > 1:
+                    # Downmix with a weighted dot straight into the block.
+                    channels = data.shape[1]
+                    if len(mix_weights) != channels:
+                        mix_weights = np.full(channels, 1.0 / channels, dtype=np.float32)
+                    if data.dtype == np.float32:
+                        np.dot(data, mix_weights, out=samples)
+                    else:
+                        np.copyto(samples, data @ mix_weights, casting="unsafe")
+                else:
+                    np.copyto(samples, data.reshape(n), casting="unsafe")
+                np.clip(samples, -1.0, 1.0, out=samples)
+                # Whisper consumes float32 in [-1, 1], so blocks are queued as-is.
+                if float(np.dot(samples, samples)) >= energy_floor * n:
+                    if not open_blocks:
+                        while preroll:
+                            audio_q.put(preroll.popleft())
+                    open_blocks = postroll_blocks
+                elif open_blocks:
+                    open_blocks -= 1
+                else:
+                    if len(preroll) == preroll.maxlen:
+                        free_blocks.put(preroll.popleft())
+                    preroll.append(samples)
+                    continue
+                audio_q.put(samples)
+                if not open_blocks:
+                    audio_q.put(GATE_CLOSED)
     except KeyboardInterrupt:
         print("\nStopping...", file=sys.stderr)
     finally:
+        audio_q.put(GATE_CLOSED)
         stop_event.set()
 
-    transcriber.join(timeout=2.0)
-    typer.join(timeout=2.0)
+    # Let the transcriber flush what was said at Ctrl+C, then let the typer finish typing it.
+    transcriber.join()
+    typing_done.set()
+    typer.join()
     print("Exited cleanly.", file=sys.stderr)
 
 
@@ -1,26 +1,61 @@
 #!/home/rkmax/Development/Scripts/.venv_voice_clipboard/bin/python
 """
-Quick CLI to record microphone audio, transcribe it with whisper CLI,
-and push the result into the system clipboard.
+Quick CLI to record microphone audio, transcribe it in-process with faster-whisper
+(falling back to openai-whisper or the whisper CLI), and push the result into the
+system clipboard.
 
 Prerequisites:
 - sox installed and available in PATH (for recording).
-- whisper CLI from openai-whisper (`pip install -U openai-whisper`).
+- faster-whisper (`pip install -U faster-whisper`, int8 weights) or openai-whisper
+  (`pip install -U openai-whisper`). Whichever imports first is used in-process;
+  the whisper CLI is the fallback.
 - Clipboard helper: pbcopy (macOS), wl-copy or xclip (Linux), or clip (Windows).
   The script will try tkinter as a last resort if those commands are absent.
+- Optional: jeepney (`pip install jeepney`) to send notifications over D-Bus
+  without spawning notify-send.
 """
 
+from __future__ import annotations
+
 import argparse
 import contextlib
-import json
+import functools
+import importlib.util
 import os
+import select
+import selectors
 import shutil
 import signal
 import subprocess
 import sys
-import tempfile
+import threading
 import time
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+# socket is only needed by the model daemon and its clients, so it is imported
+# where they use it.
+if TYPE_CHECKING:
+    import socket
+
+SAMPLE_RATE = 16000
+# Recordings shorter than this, or without a single frame louder than this
+# int16 RMS, skip whisper.
+MIN_RECORDING_SECONDS = 0.3
+SILENCE_RMS = 200
+SILENCE_FRAME_SECONDS = 0.1
+# Samples quieter than this at either end are trimmed before transcription,
+# keeping a little padding so word onsets are not clipped.
+TRIM_LEVEL = 200
+TRIM_PAD_SECONDS = 0.2
+# Files in the cache directory older than this are removed on the next run.
+CACHE_MAX_AGE_SECONDS = 24 * 3600
+# The model daemon exits after this long without a request.
+DAEMON_IDLE_SECONDS = 30 * 60
+# Clients give up on the daemon after these many seconds: connecting and pings
+# should be instant, a transcription reply may take a while on CPU.
+DAEMON_CONNECT_TIMEOUT = 2.0
+DAEMON_REPLY_TIMEOUT = 300.0
 
 
 def ensure_venv_bin_on_path() -> None:
@@ -31,20 +66,35 @@ def ensure_venv_bin_on_path() -> None:
         os.environ["PATH"] = os.pathsep.join([str(bin_dir)] + path_parts)
 
 
+@functools.lru_cache(maxsize=None)
+def which(name: str) -> str | None:
+    """shutil.which, resolved once per name; PATH is only changed before the first lookup."""
+    return shutil.which(name)
+
+
 def ensure_tool(tool_name: str) -> None:
-    if shutil.which(tool_name):
+    if which(tool_name):
         return
     raise SystemExit(f"Required tool '{tool_name}' was not found in PATH.")
 
 
+def ensure_transcriber() -> None:
+    """Require faster-whisper, openai-whisper, or at least the whisper CLI."""
+    if any(importlib.util.find_spec(name) for name in ("faster_whisper", "whisper")):
+        return
+    ensure_tool("whisper")
+
+
 def start_recording(
     target: Path,
     backend: str,
     input_device: str | None,
     input_type: str | None,
+    stream: bool = False,
 ) -> subprocess.Popen:
+    """Start the recorder writing a WAV to target, or raw s16le to stdout when stream is set (sox only)."""
     if backend == "pw-record":
-        cmd = ["pw-record", "--channels", "1", "--rate", "16000"]
+        cmd = ["pw-record", "--channels", "1", "--rate", str(SAMPLE_RATE)]
         if input_device:
             cmd.extend(["--target", input_device])
         cmd.append(str(target))
@@ -53,10 +103,15 @@ def start_recording(
         if input_type:
             cmd.extend(["-t", input_type])
         cmd.append(input_device or "-d")
-        cmd.extend(["-c", "1", "-r", "16000", "-b", "16", str(target)])
+        cmd.extend(["-c", "1", "-r", str(SAMPLE_RATE), "-b", "16"])
+        if stream:
+            cmd.extend(["-e", "signed-integer", "-t", "raw", "-"])
+        else:
+            cmd.append(str(target))
 
+    stdout = subprocess.PIPE if stream else subprocess.DEVNULL
     try:
-        return subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return subprocess.Popen(cmd, stdout=stdout, stderr=subprocess.DEVNULL)
     except FileNotFoundError as exc:
         raise SystemExit(f"{backend} is not installed or not in PATH.") from exc
 
@@ -70,7 +125,299 @@ def stop_recording(proc: subprocess.Popen) -> None:
         proc.wait()
 
 
-def run_whisper(audio_path: Path, model: str, language: str | None) -> Path:
+def cache_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    path = Path(base) / "voice_clipboard"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def sweep_cache(directory: Path, max_age: float = CACHE_MAX_AGE_SECONDS) -> None:
+    """Delete leftovers (crashed runs, --keep-temp files) not modified for max_age seconds."""
+    cutoff = time.time() - max_age
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            with contextlib.suppress(OSError):
+                if entry.is_file() and entry.stat().st_mtime < cutoff:
+                    os.unlink(entry.path)
+
+
+def new_recording_path() -> Path:
+    directory = cache_dir()
+    sweep_cache(directory)
+    return directory / f"recording-{os.getpid()}.wav"
+
+
+def remove_run_files(audio_path: Path) -> None:
+    for path in (audio_path, audio_path.with_suffix(".txt")):
+        with contextlib.suppress(FileNotFoundError):
+            path.unlink()
+
+
+def write_wav(path: Path, pcm: bytes | bytearray) -> None:
+    import wave
+
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(pcm)
+
+
+def pcm_span(audio_path: Path) -> tuple[int, int] | None:
+    """Return (data offset, frame count) of a 16-bit mono WAV, or None if it is not one we wrote."""
+    with open(audio_path, "rb") as handle:
+        head = handle.read(4096)
+        # Size from the file, not the header: a killed recorder may not have patched it.
+        size = os.fstat(handle.fileno()).st_size
+    data_at = head.find(b"data")
+    if not head.startswith(b"RIFF") or data_at < 0:
+        return None
+    start = data_at + 8
+    return start, max(size - start, 0) // 2
+
+
+def recording_problem(audio_path: Path) -> str | None:
+    """Return why a 16-bit mono WAV is not worth transcribing (too short or silent), or None."""
+    span = pcm_span(audio_path)
+    if span is None:
+        return None
+    start, frames = span
+    if frames < MIN_RECORDING_SECONDS * SAMPLE_RATE:
+        return f"Recording too short ({frames / SAMPLE_RATE:.2f}s); nothing to transcribe."
+
+    try:
+        import numpy as np
+    except ImportError:
+        return None
+    samples = np.memmap(audio_path, dtype="<i2", mode="r", offset=start, shape=(frames,))
+    # Judge the loudest frame, not the whole file: a long recording with a few
+    # words in it averages out below the threshold.
+    frame_len = int(SILENCE_FRAME_SECONDS * SAMPLE_RATE)
+    level = samples[: frames - frames % frame_len].astype(np.float32).reshape(-1, frame_len)
+    rms = float(np.sqrt(np.einsum("ij,ij->i", level, level).max() / frame_len))
+    if rms < SILENCE_RMS:
+        return f"Recording is silent (loudest frame RMS {rms:.0f}); nothing to transcribe."
+    return None
+
+
+def trimmed_audio(audio_path: Path):
+    """Load a recording as float32 with leading and trailing silence cut off.
+
+    Whisper would otherwise decode the silence before the first and after the
+    last word. Falls back to the path when numpy is missing or the file is not
+    a plain 16-bit WAV.
+    """
+    span = pcm_span(audio_path)
+    try:
+        import numpy as np
+    except ImportError:
+        return str(audio_path)
+    if span is None or not span[1]:
+        return str(audio_path)
+    start, frames = span
+    samples = np.memmap(audio_path, dtype="<i2", mode="r", offset=start, shape=(frames,))
+    loud = np.abs(samples) > TRIM_LEVEL
+    if not loud.any():
+        return str(audio_path)
+    pad = int(TRIM_PAD_SECONDS * SAMPLE_RATE)
+    lo = max(int(loud.argmax()) - pad, 0)
+    hi = min(frames - int(loud[::-1].argmax()) + pad, frames)
+    if hi - lo < MIN_RECORDING_SECONDS * SAMPLE_RATE:
+        return str(audio_path)
+    return samples[lo:hi].astype(np.float32) / 32768.0
+
+
+_WHISPER_MODELS: dict[tuple[str, str], object] = {}
+
+
+def join_segments(lines: list[str]) -> str:
+    """One line per segment, the same layout as the whisper CLI's .txt output."""
+    return "\n".join(line.strip() for line in lines).strip()
+
+
+def save_transcript(audio_path: Path, transcript: str) -> None:
+    """Leave the transcript next to the audio for --keep-temp, unless the CLI already did."""
+    output = audio_path.with_suffix(".txt")
+    if not output.exists():
+        output.write_text(transcript + "\n", encoding="utf-8")
+
+
+def language_code(language: str | None) -> str | None:
+    """Map a language name such as 'Spanish' to the code faster-whisper expects."""
+    if not language or len(language) <= 3:
+        return language.lower() if language else None
+    try:
+        from whisper.tokenizer import TO_LANGUAGE_CODE  # type: ignore
+    except ImportError:
+        TO_LANGUAGE_CODE = {}
+    code = TO_LANGUAGE_CODE.get(language.lower())
+    if code is None:
+        print(f"Unknown language name '{language}'; letting faster-whisper detect it.", file=sys.stderr)
+    return code
+
+
+def load_faster_whisper(model: str):
+    """Load (once per process) a faster-whisper model with int8 weights; None if not installed."""
+    try:
+        import ctranslate2  # type: ignore
+        from faster_whisper import WhisperModel  # type: ignore
+    except ImportError:
+        return None
+
+    loaded = _WHISPER_MODELS.get(("faster-whisper", model))
+    if loaded is None:
+        if ctranslate2.get_cuda_device_count() > 0:
+            device, compute_type = "cuda", "int8_float16"
+        else:
+            device, compute_type = "cpu", "int8"
+        loaded = WhisperModel(model, device=device, compute_type=compute_type)
+        _WHISPER_MODELS[("faster-whisper", model)] = loaded
+    return loaded
+
+
+def load_openai_whisper(model: str):
+    """Load (once per process) an openai-whisper model; None if not installed."""
+    try:
+        import whisper  # type: ignore
+    except ImportError:
+        return None
+
+    loaded = _WHISPER_MODELS.get(("whisper", model))
+    if loaded is None:
+        loaded = _WHISPER_MODELS[("whisper", model)] = whisper.load_model(model)
+    return loaded
+
+
+class TranscriptionCancelled(Exception):
+    pass
+
+
+def transcribe_lines(audio, model: str, language: str | None, cancelled=None) -> list[str] | None:
+    """Transcribe a path or float32 array in-process, one string per segment.
+
+    faster-whisper is preferred over openai-whisper; None means neither is installed.
+    faster-whisper decodes lazily, so cancelled() is checked between segments and
+    TranscriptionCancelled raised once it returns True.
+    """
+    loaded = load_faster_whisper(model)
+    if loaded is not None:
+        segments, _info = loaded.transcribe(audio, language=language_code(language))
+        lines = []
+        for segment in segments:
+            if cancelled is not None and cancelled():
+                raise TranscriptionCancelled
+            lines.append(segment.text)
+        return lines
+
+    loaded = load_openai_whisper(model)
+    if loaded is not None:
+        result = loaded.transcribe(audio, language=language, fp16=loaded.device.type == "cuda")
+        return [segment["text"] for segment in result["segments"]]
+    return None
+
+
+def in_process_available() -> bool:
+    return any(importlib.util.find_spec(name) for name in ("faster_whisper", "whisper"))
+
+
+class StreamingTranscriber:
+    """Transcribes a raw 16 kHz s16le recorder stream window by window while it records.
+
+    The model is loaded as soon as recording starts and every full window is
+    transcribed in the background, so stopping only leaves the last partial
+    window to do.
+    """
+
+    window_seconds = 30.0
+    # Windows are cut at the quietest 100 ms frame in their last two seconds.
+    cut_search_seconds = 2.0
+    cut_frame_seconds = 0.1
+
+    def __init__(self, stream, model: str, language: str | None) -> None:
+        self._stream = stream
+        self._model = model
+        self._language = language
+        self._pcm = bytearray()
+        self._lock = threading.Lock()
+        self._lines: list[str] = []
+        self._done = 0
+        self._error: Exception | None = None
+        self._eof = threading.Event()
+        self._reader = threading.Thread(target=self._read, daemon=True)
+        self._worker = threading.Thread(target=self._transcribe_windows, daemon=True)
+        self._reader.start()
+        self._worker.start()
+
+    @property
+    def samples(self) -> int:
+        with self._lock:
+            return len(self._pcm) // 2
+
+    def _read(self) -> None:
+        try:
+            while chunk := self._stream.read1(65536):
+                with self._lock:
+                    self._pcm += chunk
+        finally:
+            self._eof.set()
+
+    def _audio(self, start: int, end: int):
+        import numpy as np
+
+        with self._lock:
+            pcm = bytes(self._pcm[start * 2 : end * 2])
+        return np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+
+    def _quiet_cut(self, audio) -> int:
+        frame = int(SAMPLE_RATE * self.cut_frame_seconds)
+        search = int(SAMPLE_RATE * self.cut_search_seconds) // frame * frame
+        tail = audio[len(audio) - search :].reshape(-1, frame)
+        quietest = int((tail * tail).sum(axis=1).argmin())
+        return len(audio) - search + quietest * frame + frame // 2
+
+    def _transcribe(self, audio) -> None:
+        lines = transcribe_lines(audio, self._model, self._language)
+        if lines is None:
+            raise RuntimeError("No in-process whisper backend is available.")
+        self._lines.extend(lines)
+
+    def _transcribe_windows(self) -> None:
+        window = int(SAMPLE_RATE * self.window_seconds)
+        try:
+            # Load the model while the user is still talking.
+            if load_faster_whisper(self._model) is None:
+                load_openai_whisper(self._model)
+            while not self._eof.wait(0.5):
+                if self.samples - self._done < window:
+                    continue
+                audio = self._audio(self._done, self._done + window)
+                cut = self._quiet_cut(audio)
+                self._transcribe(audio[:cut])
+                self._done += cut
+        except Exception as exc:  # noqa: BLE001
+            self._error = exc
+
+    def close(self, audio_path: Path) -> None:
+        """Wait for the stream to end and save what was captured as a WAV."""
+        self._reader.join()
+        self._worker.join()
+        write_wav(audio_path, self._pcm)
+
+    def finish(self) -> list[str]:
+        """Transcribe what is left after close() and return all segment texts."""
+        if self._error is not None:
+            raise self._error
+        if self.samples > self._done:
+            self._transcribe(self._audio(self._done, self.samples))
+        return self._lines
+
+
+def run_whisper(audio_path: Path, model: str, language: str | None) -> str:
+    lines = transcribe_lines(trimmed_audio(audio_path), model, language)
+    if lines is not None:
+        return join_segments(lines)
+
     cmd = [
         "whisper",
         str(audio_path),
@@ -86,15 +433,31 @@ def run_whisper(audio_path: Path, model: str, language: str | None) -> Path:
 
     subprocess.run(cmd, check=True)
 
-    expected = audio_path.with_suffix(".txt")
-    if expected.exists():
-        return expected
+    try:
+        return audio_path.with_suffix(".txt").read_text(encoding="utf-8").strip()
+    except FileNotFoundError as exc:
+        raise RuntimeError("Could not locate transcription output produced by whisper.") from exc
+
+
+_WORKING_HELPERS: set[str] = set()
 
-    for candidate in audio_path.parent.glob("*.txt"):
-        if audio_path.stem in candidate.stem:
-            return candidate
 
-    raise RuntimeError("Could not locate transcription output produced by whisper.")
+def run_helper(commands: list[list[str]], **kwargs) -> str | None:
+    """Run the first command on PATH that succeeds and return its program name.
+
+    Helpers that already worked in this run are tried first, so the second
+    notification of a stop does not retry ones that failed for the first.
+    """
+    available = [cmd for cmd in commands if which(cmd[0])]
+    available.sort(key=lambda cmd: cmd[0] not in _WORKING_HELPERS)
+    for cmd in available:
+        try:
+            subprocess.run(cmd, check=True, **kwargs)
+        except subprocess.CalledProcessError:
+            continue
+        _WORKING_HELPERS.add(cmd[0])
+        return cmd[0]
+    return None
 
 
 def copy_to_clipboard(text: str) -> str | None:
@@ -105,14 +468,9 @@ def copy_to_clipboard(text: str) -> str | None:
         ["clip"],
     ]
 
-    for cmd in candidates:
-        if shutil.which(cmd[0]) is None:
-            continue
-        try:
-            subprocess.run(cmd, input=text.encode("utf-8"), check=True)
-            return cmd[0]
-        except subprocess.CalledProcessError:
-            continue
+    used = run_helper(candidates, input=text.encode("utf-8"))
+    if used:
+        return used
 
     try:
         import tkinter  # type: ignore
@@ -128,9 +486,46 @@ def copy_to_clipboard(text: str) -> str | None:
         return None
 
 
+@functools.lru_cache(maxsize=None)
+def notification_bus():
+    """Session D-Bus connection for notifications, opened once per run; None without jeepney or a bus."""
+    try:
+        from jeepney.io.blocking import open_dbus_connection  # type: ignore
+    except ImportError:
+        return None
+    try:
+        return open_dbus_connection(bus="SESSION")
+    except Exception:
+        return None
+
+
+def notify_dbus(title: str, message: str) -> bool:
+    """Call org.freedesktop.Notifications.Notify directly instead of spawning notify-send."""
+    connection = notification_bus()
+    if connection is None:
+        return False
+    from jeepney import DBusAddress, new_method_call, unwrap_msg  # type: ignore
+
+    address = DBusAddress(
+        "/org/freedesktop/Notifications",
+        bus_name="org.freedesktop.Notifications",
+        interface="org.freedesktop.Notifications",
+    )
+    msg = new_method_call(
+        address, "Notify", "susssasa{sv}i", ("voice_clipboard", 0, "", title, message, [], {}, -1)
+    )
+    try:
+        unwrap_msg(connection.send_and_get_reply(msg, timeout=2))
+    except Exception:
+        return False
+    return True
+
+
 def send_notification(title: str, message: str) -> str | None:
     title = title.strip()
     message = message.strip()
+    if notify_dbus(title, message):
+        return "D-Bus"
     escaped_title = title.replace("\\", "\\\\").replace('"', '\\"')
     escaped_message = message.replace("\\", "\\\\").replace('"', '\\"')
 
@@ -140,15 +535,7 @@ def send_notification(title: str, message: str) -> str | None:
         ["terminal-notifier", "-title", title, "-message", message],
     ]
 
-    for cmd in commands:
-        if shutil.which(cmd[0]) is None:
-            continue
-        try:
-            subprocess.run(cmd, check=True)
-            return cmd[0]
-        except subprocess.CalledProcessError:
-            continue
-    return None
+    return run_helper(commands)
 
 
 def process_alive(pid: int) -> bool:
@@ -159,7 +546,65 @@ def process_alive(pid: int) -> bool:
     return True
 
 
+def process_start_time(pid: int) -> int | None:
+    """Start time of pid in clock ticks since boot (Linux /proc), or None where unavailable."""
+    try:
+        stat = Path(f"/proc/{pid}/stat").read_bytes()
+    except OSError:
+        return None
+    # Field 22; the command name before it may contain spaces, so split after it.
+    return int(stat.rsplit(b")", 1)[1].split()[19])
+
+
+def recorder_alive(state: dict) -> bool:
+    """Whether the recorder in state still runs, and is not an unrelated process that reused its pid."""
+    pid = state.get("pid", -1)
+    if not process_alive(pid):
+        return False
+    started = state.get("pid_start")
+    return started is None or process_start_time(pid) in (None, started)
+
+
 def wait_for_termination(pid: int, timeout: float = 5.0) -> None:
+    try:
+        pidfd = os.pidfd_open(pid)
+    except ProcessLookupError:
+        return
+    except (AttributeError, OSError):
+        pidfd = None
+
+    if pidfd is not None:
+        # The pidfd becomes readable when the process exits; no polling loop needed.
+        try:
+            poller = select.poll()
+            poller.register(pidfd, select.POLLIN)
+            if poller.poll(int(timeout * 1000)):
+                return
+            with contextlib.suppress(OSError):
+                signal.pidfd_send_signal(pidfd, signal.SIGKILL)
+            poller.poll(1000)
+            return
+        finally:
+            os.close(pidfd)
+
+    if hasattr(select, "kqueue"):
+        # BSD/macOS: NOTE_EXIT works for processes we did not fork, unlike SIGCHLD.
+        queue = select.kqueue()
+        try:
+            event = select.kevent(
+                pid, filter=select.KQ_FILTER_PROC, flags=select.KQ_EV_ADD, fflags=select.KQ_NOTE_EXIT
+            )
+            try:
+                if queue.control([event], 1, timeout):
+                    return
+            except ProcessLookupError:
+                return
+            with contextlib.suppress(OSError):
+                os.kill(pid, signal.SIGKILL)
+            return
+        finally:
+            queue.close()
+
     start = time.monotonic()
     while time.monotonic() - start < timeout:
         if not process_alive(pid):
@@ -171,17 +616,54 @@ def wait_for_termination(pid: int, timeout: float = 5.0) -> None:
         return
 
 
+def encode_json(data: dict) -> bytes:
+    try:
+        import orjson  # type: ignore
+    except ImportError:
+        import json
+
+        return json.dumps(data).encode("utf-8")
+    return orjson.dumps(data)
+
+
+def decode_json(raw: bytes):
+    try:
+        import orjson  # type: ignore
+    except ImportError:
+        import json
+
+        return json.loads(raw)
+    return orjson.loads(raw)
+
+
 def load_state(path: Path) -> dict | None:
-    if not path.exists():
+    try:
+        raw = path.read_bytes()
+    except OSError:
         return None
     try:
-        return json.loads(path.read_text(encoding="utf-8"))
+        return decode_json(raw)
     except Exception:
         return None
 
 
+def atomic_write(path: Path, payload: bytes) -> None:
+    """Replace path with payload (mode 0600) so readers see the old or new file, never a partial one."""
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view):]
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, path)
+
+
 def save_state(path: Path, data: dict) -> None:
-    path.write_text(json.dumps(data), encoding="utf-8")
+    """Write the state atomically so a concurrent stop never reads a half-written file."""
+    atomic_write(path, encode_json(data))
 
 
 def clear_state(path: Path) -> None:
@@ -189,9 +671,200 @@ def clear_state(path: Path) -> None:
         path.unlink()
 
 
+def daemon_socket_path() -> Path:
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    base = Path(runtime_dir) if runtime_dir else cache_dir()
+    return base / "voice_clipboard.sock"
+
+
+def peer_uid(conn: socket.socket) -> int | None:
+    import socket
+    import struct
+
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+    creds = conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    _pid, uid, _gid = struct.unpack("3i", creds)
+    return uid
+
+
+def read_message(conn: socket.socket) -> bytes:
+    chunks = []
+    while chunk := conn.recv(65536):
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def peer_gone(conn: socket.socket) -> bool:
+    """Whether the client closed its end, e.g. after giving up on a slow reply."""
+    poller = select.poll()
+    poller.register(conn, select.POLLHUP)
+    return bool(poller.poll(0))
+
+
+def serve_request(request: dict, conn: socket.socket) -> dict:
+    if request.get("ping"):
+        return {"ok": True}
+    audio = trimmed_audio(Path(request["path"]))
+    lines = transcribe_lines(
+        audio, request.get("model") or "base", request.get("language"), cancelled=lambda: peer_gone(conn)
+    )
+    if lines is None:
+        return {"error": "No in-process whisper backend is available."}
+    return {"text": join_segments(lines)}
+
+
+def serve_connection(conn: socket.socket) -> None:
+    with conn:
+        conn.setblocking(True)
+        uid = peer_uid(conn)
+        if uid is not None and uid != os.getuid():
+            return
+        try:
+            reply = serve_request(decode_json(read_message(conn)), conn)
+        except TranscriptionCancelled:
+            return
+        except Exception as exc:  # noqa: BLE001
+            reply = {"error": str(exc)}
+        with contextlib.suppress(OSError):
+            conn.sendall(encode_json(reply))
+
+
+def serve_daemon(model: str, idle_timeout: float = DAEMON_IDLE_SECONDS) -> None:
+    """Keep whisper models loaded and transcribe files for start/stop runs over a unix socket.
+
+    Only connections from the same user are served. Exits after idle_timeout
+    seconds without a request, or on SIGINT/SIGTERM. Signals only wake the
+    accept loop through a self-pipe, so a transcription in progress finishes
+    and connections already queued are answered before the socket is removed.
+    """
+    import socket
+
+    path = daemon_socket_path()
+    # A socket nobody listens on is a leftover from a killed daemon. Any other
+    # outcome, including a ping timeout from a busy daemon, means one is running.
+    try:
+        daemon_exchange({"ping": True})
+    except (FileNotFoundError, ConnectionRefusedError):
+        with contextlib.suppress(FileNotFoundError):
+            path.unlink()
+    except Exception:  # noqa: BLE001
+        return
+    else:
+        return
+    read_fd, write_fd = os.pipe()
+    os.set_blocking(write_fd, False)
+    previous_fd = signal.set_wakeup_fd(write_fd)
+    previous_handlers = {
+        signum: signal.signal(signum, lambda *_: None) for signum in (signal.SIGINT, signal.SIGTERM)
+    }
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    bound_inode = None
+    try:
+        server.bind(str(path))
+        bound_inode = path.stat().st_ino
+        os.chmod(path, 0o600)
+        server.listen()
+        server.setblocking(False)
+        # Load while the recording that started us is still running.
+        if load_faster_whisper(model) is None:
+            load_openai_whisper(model)
+        with selectors.DefaultSelector() as selector:
+            selector.register(server, selectors.EVENT_READ)
+            selector.register(read_fd, selectors.EVENT_READ)
+            while True:
+                ready = selector.select(idle_timeout)
+                if not ready:
+                    return
+                if any(key.fileobj == read_fd for key, _events in ready):
+                    break
+                with contextlib.suppress(BlockingIOError):
+                    serve_connection(server.accept()[0])
+            # Shutting down: answer whatever is already queued, then exit.
+            while True:
+                try:
+                    conn, _addr = server.accept()
+                except BlockingIOError:
+                    return
+                serve_connection(conn)
+    finally:
+        server.close()
+        # Only remove our own socket, never one a newer daemon bound at the same path.
+        with contextlib.suppress(FileNotFoundError):
+            if bound_inode is not None and path.stat().st_ino == bound_inode:
+                path.unlink()
+        signal.set_wakeup_fd(previous_fd)
+        for signum, handler in previous_handlers.items():
+            signal.signal(signum, handler)
+        os.close(read_fd)
+        os.close(write_fd)
+
+
+def daemon_exchange(request: dict, timeout: float = DAEMON_CONNECT_TIMEOUT) -> dict:
+    """Send one request to the daemon and return its reply.
+
+    Raises FileNotFoundError or ConnectionRefusedError when no daemon listens,
+    TimeoutError when it is busy or stuck.
+    """
+    import socket
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(DAEMON_CONNECT_TIMEOUT)
+        client.connect(str(daemon_socket_path()))
+        client.settimeout(timeout)
+        client.sendall(encode_json(request))
+        client.shutdown(socket.SHUT_WR)
+        raw = read_message(client)
+    # Closing the socket on timeout tells the daemon to drop the request.
+    return decode_json(raw)
+
+
+def request_daemon(request: dict, timeout: float = DAEMON_CONNECT_TIMEOUT) -> dict | None:
+    """Like daemon_exchange, but None when the daemon is absent, too slow, or the reply is unusable."""
+    try:
+        return daemon_exchange(request, timeout)
+    except TimeoutError:
+        print("Model daemon did not answer in time.", file=sys.stderr)
+        return None
+    except Exception:  # noqa: BLE001
+        return None
+
+
+def ensure_daemon(model: str) -> None:
+    """Start the model daemon in the background unless one is already running."""
+    if not in_process_available():
+        return
+    try:
+        daemon_exchange({"ping": True})
+        return
+    except (FileNotFoundError, ConnectionRefusedError):
+        pass
+    except Exception:  # noqa: BLE001
+        return  # A busy daemon does not answer pings; do not start a rival.
+    subprocess.Popen(
+        [sys.executable, str(Path(__file__).resolve()), "--action", "serve", "--model", model],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def transcribe_via_daemon(audio_path: Path, model: str, language: str | None) -> str | None:
+    reply = request_daemon(
+        {"path": str(audio_path), "model": model, "language": language}, timeout=DAEMON_REPLY_TIMEOUT
+    )
+    if not reply:
+        return None
+    if "error" in reply:
+        print(f"Model daemon failed ({reply['error']}); transcribing locally.", file=sys.stderr)
+        return None
+    return reply.get("text")
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
-        description="Record audio, transcribe with whisper CLI, and copy to clipboard."
+        description="Record audio, transcribe with faster-whisper, and copy to clipboard."
     )
     parser.add_argument(
         "--model",
@@ -201,7 +874,7 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--language",
         default=None,
-        help="Language hint passed to whisper (e.g. 'Spanish'). Leave empty to auto-detect.",
+        help="Language hint passed to whisper (e.g. 'es' or 'Spanish'). Leave empty to auto-detect.",
     )
     parser.add_argument(
         "--no-clipboard",
@@ -226,7 +899,7 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--keep-temp",
         action="store_true",
-        help="Keep temporary WAV/TXT files for inspection (prints the directory path).",
+        help="Keep the WAV/TXT files in the cache directory for inspection (removed after a day).",
     )
     parser.add_argument(
         "--backend",
@@ -236,9 +909,12 @@ def parse_args() -> argparse.Namespace:
     )
     parser.add_argument(
         "--action",
-        choices=["interactive", "start", "stop", "toggle"],
+        choices=["interactive", "start", "stop", "toggle", "serve"],
         default="interactive",
-        help="Recording flow: interactive prompts, or start/stop/toggle for automation (e.g. Stream Deck).",
+        help=(
+            "Recording flow: interactive prompts, or start/stop/toggle for automation (e.g. Stream Deck). "
+            "'serve' runs the model daemon that start launches to keep whisper loaded for stop."
+        ),
     )
     parser.add_argument(
         "--state-file",
@@ -248,44 +924,103 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
+def read_enter() -> bool:
+    try:
+        input()
+    except (EOFError, KeyboardInterrupt):
+        return False
+    return True
+
+
+def wait_for_enter(prompt: str = "") -> bool:
+    """Block until Enter is pressed; return False on EOF or when SIGINT/SIGTERM arrives.
+
+    Signals wake the wait through a self-pipe, so SIGTERM stops the recording
+    cleanly instead of killing the process with the recorder still running.
+    """
+    if prompt:
+        print(prompt, end="", flush=True)
+    with selectors.DefaultSelector() as selector:
+        try:
+            selector.register(sys.stdin, selectors.EVENT_READ)
+        except (OSError, ValueError):
+            # epoll rejects regular files and /dev/null; those never block anyway.
+            return read_enter()
+
+        read_fd, write_fd = os.pipe()
+        os.set_blocking(write_fd, False)
+        try:
+            previous_fd = signal.set_wakeup_fd(write_fd)
+        except ValueError:
+            # Not the main thread; fall back to a plain blocking read.
+            os.close(read_fd)
+            os.close(write_fd)
+            return read_enter()
+
+        previous_handlers = {
+            signum: signal.signal(signum, lambda *_: None) for signum in (signal.SIGINT, signal.SIGTERM)
+        }
+        try:
+            selector.register(read_fd, selectors.EVENT_READ)
+            while True:
+                for key, _events in selector.select():
+                    if key.fileobj is not sys.stdin:
+                        return False
+                    return bool(sys.stdin.readline())
+        finally:
+            signal.set_wakeup_fd(previous_fd)
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
+            os.close(read_fd)
+            os.close(write_fd)
+
+
 def interactive_flow(args: argparse.Namespace) -> None:
-    temp_ctx = None
+    audio_path = new_recording_path()
+    keep_audio = args.keep_temp
     if args.keep_temp:
-        tmpdir = tempfile.mkdtemp(prefix="voice_clipboard_")
-        cleanup = lambda: None  # noqa: E731
-        print(f"Keeping temp files in: {tmpdir}")
-    else:
-        temp_ctx = tempfile.TemporaryDirectory(prefix="voice_clipboard_")
-        tmpdir = temp_ctx.name
-        cleanup = temp_ctx.cleanup
+        print(f"Keeping recording files in: {audio_path.parent}")
 
     try:
-        tmp_path = Path(tmpdir)
-        audio_path = tmp_path / "recording.wav"
-
         print("Press Enter to start recording. Press Enter again to stop.")
-        input()
+        if not wait_for_enter():
+            raise SystemExit("Cancelled.")
 
-        proc = start_recording(audio_path, args.backend, args.input_device, args.input_type)
+        model = args.model or "base"
+        # With sox and an in-process backend, transcription runs while recording.
+        streaming = args.backend == "sox" and in_process_available()
+        proc = start_recording(
+            audio_path, args.backend, args.input_device, args.input_type, stream=streaming
+        )
+        streamer = StreamingTranscriber(proc.stdout, model, args.language) if streaming else None
         try:
-            input("Recording... press Enter to stop.\n")
-        except KeyboardInterrupt:
-            print("\nStopping recording...")
+            if not wait_for_enter("Recording... press Enter to stop.\n"):
+                print("\nStopping recording...")
         finally:
             stop_recording(proc)
 
+        if streamer is not None:
+            streamer.close(audio_path)
         if not audio_path.exists() or audio_path.stat().st_size == 0:
             raise SystemExit(
                 "No audio captured. Check microphone permissions, input device, and try again."
             )
+        problem = recording_problem(audio_path)
+        if problem:
+            # Keep the audio in case the check misjudged it; sweep_cache removes it later.
+            keep_audio = True
+            raise SystemExit(f"{problem} Recording kept at {audio_path}.")
 
-        model = args.model or "base"
         print("Transcribing with whisper...")
-        transcript_file = run_whisper(audio_path, model, args.language)
-        transcript = transcript_file.read_text(encoding="utf-8").strip()
+        if streamer is not None:
+            transcript = join_segments(streamer.finish())
+        else:
+            transcript = run_whisper(audio_path, model, args.language)
 
         if not transcript:
             raise SystemExit("Whisper returned an empty transcript.")
+        if args.keep_temp:
+            save_transcript(audio_path, transcript)
 
         print("\n--- Transcript ---\n")
         print(transcript)
@@ -308,24 +1043,25 @@ def interactive_flow(args: argparse.Namespace) -> None:
             else:
                 print("Notification command not available; skipped.")
     finally:
-        cleanup()
+        if not keep_audio:
+            remove_run_files(audio_path)
 
 
 def handle_start(args: argparse.Namespace, state_path: Path) -> None:
     state = load_state(state_path)
-    if state and process_alive(state.get("pid", -1)):
+    if state and recorder_alive(state):
         raise SystemExit(f"Recording already in progress (pid {state['pid']}). Use --action stop.")
-    if state and not process_alive(state.get("pid", -1)):
+    if state:
         clear_state(state_path)
 
-    tmpdir = tempfile.mkdtemp(prefix="voice_clipboard_")
-    audio_path = Path(tmpdir) / "recording.wav"
+    audio_path = new_recording_path()
 
     proc = start_recording(audio_path, args.backend, args.input_device, args.input_type)
     model = args.model or "base"
 
     state_data = {
         "pid": proc.pid,
+        "pid_start": process_start_time(proc.pid),
         "backend": args.backend,
         "input_device": args.input_device,
         "input_type": args.input_type,
@@ -334,11 +1070,11 @@ def handle_start(args: argparse.Namespace, state_path: Path) -> None:
         "no_clipboard": args.no_clipboard,
         "no_notify": args.no_notify,
         "keep_temp": args.keep_temp,
-        "tmp_dir": tmpdir,
         "audio_path": str(audio_path),
     }
     save_state(state_path, state_data)
     print(f"Recording started (pid {proc.pid}). State stored at {state_path}.")
+    ensure_daemon(model)
     if not args.no_notify:
         notif_used = send_notification(
             "Voice capture started",
@@ -357,9 +1093,8 @@ def handle_stop(
 
     pid = state.get("pid")
     audio_path = Path(state.get("audio_path", ""))
-    tmp_dir = Path(state.get("tmp_dir", audio_path.parent))
 
-    if pid and process_alive(pid):
+    if pid and recorder_alive(state):
         try:
             os.kill(pid, signal.SIGTERM)
         except OSError:
@@ -371,6 +1106,10 @@ def handle_stop(
         raise SystemExit(
             f"No audio captured at {audio_path}. Check input device and try again."
         )
+    problem = recording_problem(audio_path)
+    if problem:
+        clear_state(state_path)
+        raise SystemExit(f"{problem} Recording kept at {audio_path}.")
 
     model = args.model or state.get("model", "base")
     language = args.language if args.language is not None else state.get("language")
@@ -387,11 +1126,14 @@ def handle_stop(
             print(f"Stop notification sent via {notif_used}.")
 
     print("Transcribing with whisper...")
-    transcript_file = run_whisper(audio_path, model, language)
-    transcript = transcript_file.read_text(encoding="utf-8").strip()
+    transcript = transcribe_via_daemon(audio_path, model, language)
+    if transcript is None:
+        transcript = run_whisper(audio_path, model, language)
 
     if not transcript:
         raise SystemExit("Whisper returned an empty transcript.")
+    if keep_temp:
+        save_transcript(audio_path, transcript)
 
     print("\n--- Transcript ---\n")
     print(transcript)
@@ -415,10 +1157,12 @@ def handle_stop(
             print("Notification command not available; skipped.")
 
     if keep_temp:
-        print(f"Keeping temp files in: {tmp_dir}")
+        print(f"Keeping recording files in: {audio_path.parent}")
     else:
-        with contextlib.suppress(Exception):
-            shutil.rmtree(tmp_dir, ignore_errors=True)
+        remove_run_files(audio_path)
+        # State written before the cache directory existed points at a private temp dir.
+        if state.get("tmp_dir"):
+            shutil.rmtree(state["tmp_dir"], ignore_errors=True)
 
     clear_state(state_path)
     print("Recording state cleared.")
@@ -429,32 +1173,36 @@ def main() -> None:
     args = parse_args()
     state_path = Path(args.state_file)
 
+    if args.action == "serve":
+        serve_daemon(args.model or "base")
+        return
+
     if args.action == "interactive":
         ensure_tool(args.backend)
-        ensure_tool("whisper")
+        ensure_transcriber()
         interactive_flow(args)
         return
 
     if args.action == "start":
         ensure_tool(args.backend)
-        ensure_tool("whisper")
+        ensure_transcriber()
         handle_start(args, state_path)
         return
 
     if args.action == "stop":
-        ensure_tool("whisper")
+        ensure_transcriber()
         handle_stop(args, state_path)
         return
 
     if args.action == "toggle":
         state = load_state(state_path)
-        alive = state is not None and process_alive(state.get("pid", -1))
+        alive = state is not None and recorder_alive(state)
         if alive:
-            ensure_tool("whisper")
+            ensure_transcriber()
             handle_stop(args, state_path, preloaded_state=state)
         else:
             ensure_tool(args.backend)
-            ensure_tool("whisper")
+            ensure_transcriber()
             handle_start(args, state_path)
         return
 